@@ -5,7 +5,6 @@ to a typed `Settings` model.
 """
 
 import os
-from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +13,8 @@ from pydantic import BaseModel, ConfigDict
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 CONFIG_PATH = BASE_DIR / "config.yml"
+# libyaml-backed loader is much faster; fall back to pure Python when unavailable.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class Settings(BaseModel):
@@ -25,9 +26,15 @@ class Settings(BaseModel):
     github_token: str = ""
     github_app_token: str = ""
     database_url: str = "sqlite:///./data/app.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
     github_api_base: str = "https://api.github.com"
     scan_rate_limit_per_minute: int = 25
     scan_daily_quota: int = 300
+    scan_shared_counters: str = ""
+    scan_cpu_workers: int = 0
+    scan_osv_cache_path: str = ""
+    scan_osv_cache_ttl_seconds: int = 86400
     scan_cache_ttl_seconds: int = 1800
     repo_history_keep: int = 20
     stale_active_job_minutes: int = 120
@@ -41,10 +48,11 @@ def _read_yaml_config() -> dict[str, Any]:
     Returns an empty mapping when config file does not exist.
     """
 
-    if not CONFIG_PATH.exists():
+    try:
+        data = CONFIG_PATH.read_bytes()
+    except FileNotFoundError:
         return {}
-    with CONFIG_PATH.open("r", encoding="utf-8") as fp:
-        raw = yaml.safe_load(fp) or {}
+    raw = yaml.load(data, Loader=YAML_LOADER) or {}
     if not isinstance(raw, dict):
         raise ValueError("config.yml root must be an object")
     return raw
@@ -71,11 +79,20 @@ def _extract_nested(raw: dict[str, Any]) -> dict[str, Any]:
         "github_app_token": github_map.get("app_token", raw.get("github_app_token")),
         "github_api_base": github_map.get("api_base", raw.get("github_api_base")),
         "database_url": database_map.get("url", raw.get("database_url")),
+        "db_pool_size": database_map.get("pool_size", raw.get("db_pool_size")),
+        "db_max_overflow": database_map.get("max_overflow", raw.get("db_max_overflow")),
         "scan_rate_limit_per_minute": scan_map.get(
             "rate_limit_per_minute",
             raw.get("scan_rate_limit_per_minute"),
         ),
         "scan_daily_quota": scan_map.get("daily_quota", raw.get("scan_daily_quota")),
+        "scan_shared_counters": scan_map.get("shared_counters", raw.get("scan_shared_counters")),
+        "scan_cpu_workers": scan_map.get("cpu_workers", raw.get("scan_cpu_workers")),
+        "scan_osv_cache_path": scan_map.get("osv_cache_path", raw.get("scan_osv_cache_path")),
+        "scan_osv_cache_ttl_seconds": scan_map.get(
+            "osv_cache_ttl_seconds",
+            raw.get("scan_osv_cache_ttl_seconds"),
+        ),
         "scan_cache_ttl_seconds": scan_map.get("cache_ttl_seconds", raw.get("scan_cache_ttl_seconds")),
         "repo_history_keep": scan_map.get("repo_history_keep", raw.get("repo_history_keep")),
         "stale_active_job_minutes": scan_map.get(
@@ -96,8 +113,14 @@ def _env_override_map() -> dict[str, Any]:
         "github_app_token": os.getenv("RQI_GITHUB_APP_TOKEN"),
         "github_api_base": os.getenv("RQI_GITHUB_API_BASE"),
         "database_url": os.getenv("RQI_DATABASE_URL"),
+        "db_pool_size": _env_int("RQI_DB_POOL_SIZE"),
+        "db_max_overflow": _env_int("RQI_DB_MAX_OVERFLOW"),
         "scan_rate_limit_per_minute": _env_int("RQI_SCAN_RATE_LIMIT_PER_MINUTE"),
         "scan_daily_quota": _env_int("RQI_SCAN_DAILY_QUOTA"),
+        "scan_shared_counters": os.getenv("RQI_SCAN_SHARED_COUNTERS"),
+        "scan_cpu_workers": _env_int("RQI_SCAN_CPU_WORKERS"),
+        "scan_osv_cache_path": os.getenv("RQI_SCAN_OSV_CACHE_PATH"),
+        "scan_osv_cache_ttl_seconds": _env_int("RQI_SCAN_OSV_CACHE_TTL_SECONDS"),
         "scan_cache_ttl_seconds": _env_int("RQI_SCAN_CACHE_TTL_SECONDS"),
         "repo_history_keep": _env_int("RQI_REPO_HISTORY_KEEP"),
         "stale_active_job_minutes": _env_int("RQI_STALE_ACTIVE_JOB_MINUTES"),
@@ -114,14 +137,20 @@ def _env_int(name: str) -> int | None:
         return None
 
 
-@lru_cache
-def get_settings() -> Settings:
-    """Return cached settings instance.
-
-    Caching avoids repeated file I/O on every request.
-    """
+def _load_settings() -> Settings:
+    """Build settings from `config.yml` with environment overrides applied."""
 
     raw = _read_yaml_config()
     values = {key: value for key, value in _extract_nested(raw).items() if value is not None}
     values.update({key: value for key, value in _env_override_map().items() if value is not None})
     return Settings(**values)
+
+
+# Resolved once at import so hot paths read a plain module attribute.
+SETTINGS = _load_settings()
+
+
+def get_settings() -> Settings:
+    """Return process-wide settings instance."""
+
+    return SETTINGS
@@ -7,12 +7,10 @@ at startup for incremental schema changes.
 from collections.abc import Generator
 from pathlib import Path
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
-from app.config import get_settings
-
-settings = get_settings()
+from app.config import SETTINGS as settings
 
 
 def _ensure_sqlite_directory(database_url: str) -> None:
@@ -32,12 +30,51 @@ def _ensure_sqlite_directory(database_url: str) -> None:
 
 _ensure_sqlite_directory(settings.database_url)
 
+_IS_SQLITE = settings.database_url.startswith("sqlite")
+
+
+def _pool_options(database_url: str) -> dict[str, object]:
+    """Size the connection pool shared by scan workers and request handlers.
+
+    The default 5 + 10 pool starves under scan bursts. In-memory SQLite keeps its
+    single-connection pool, and file-backed SQLite needs no liveness pings.
+    """
+
+    if database_url in ("sqlite://", "sqlite:///:memory:"):
+        return {}
+    options: dict[str, object] = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+    }
+    if not database_url.startswith("sqlite"):
+        options.update(pool_pre_ping=True, pool_recycle=1800)
+    return options
+
+
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
+    connect_args={"check_same_thread": False} if _IS_SQLITE else {},
     future=True,
+    **_pool_options(settings.database_url),
 )
 
+SQLITE_SCHEMA_VERSION = 4
+
+if _IS_SQLITE:
+
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite_connection(dbapi_connection: object, _connection_record: object) -> None:
+        """Enable WAL journaling, relaxed fsync and a 64 MiB page cache for every new SQLite connection."""
+
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA cache_size=-64000")
+        finally:
+            cursor.close()
+
+
 SessionLocal = sessionmaker(
     bind=engine,
     autoflush=False,
@@ -61,9 +98,11 @@ def get_db() -> Generator[Session, None, None]:
 def ensure_sqlite_compat_schema() -> None:
     """Apply idempotent compatibility migrations for SQLite deployments."""
 
-    if not settings.database_url.startswith("sqlite"):
+    if not _IS_SQLITE:
         return
     with engine.begin() as conn:
+        if conn.execute(text("PRAGMA user_version")).scalar_one() >= SQLITE_SCHEMA_VERSION:
+            return
         columns = {row[1] for row in conn.execute(text("PRAGMA table_info(scan_jobs)")).fetchall()}
         if "commit_sha" not in columns:
             conn.execute(text("ALTER TABLE scan_jobs ADD COLUMN commit_sha VARCHAR(64)"))
@@ -75,10 +114,11 @@ def ensure_sqlite_compat_schema() -> None:
                 "ON scan_jobs (repo_owner, repo_name, status, created_at)"
             )
         )
+        conn.execute(text("DROP INDEX IF EXISTS ix_scan_jobs_repo_finished"))
         conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS ix_scan_jobs_repo_finished "
-                "ON scan_jobs (repo_owner, repo_name, finished_at)"
+                "CREATE INDEX IF NOT EXISTS ix_scan_jobs_repo_finished_created "
+                "ON scan_jobs (repo_owner, repo_name, finished_at, created_at, status, commit_sha, id)"
             )
         )
         conn.execute(
@@ -87,3 +127,16 @@ def ensure_sqlite_compat_schema() -> None:
                 "ON scan_jobs (repo_owner, repo_name, commit_sha)"
             )
         )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_scan_jobs_repo_status_finished "
+                "ON scan_jobs (repo_owner, repo_name, status, finished_at)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_scan_jobs_repo_latest "
+                "ON scan_jobs (repo_owner, repo_name) WHERE is_latest = 1"
+            )
+        )
+        conn.execute(text(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}"))
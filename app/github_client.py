@@ -7,8 +7,9 @@ from datetime import datetime
 from typing import Any
 
 import httpx
+import orjson
 
-from app.config import get_settings
+from app.config import SETTINGS
 
 
 class GitHubAPIError(Exception):
@@ -17,6 +18,12 @@ class GitHubAPIError(Exception):
     pass
 
 
+class GitHubRateLimitError(GitHubAPIError):
+    """Raised when GitHub rejects a request because the rate limit is exhausted."""
+
+    pass
+
+
 @dataclass
 class RepoSnapshot:
     """Repository data required by quality checks."""
@@ -70,105 +77,159 @@ class RepoPublicStats:
 class GitHubClient:
     """High-level GitHub API client with typed helper methods."""
 
-    LINE_COUNT_EXTENSIONS = {
-        ".py",
-        ".js",
-        ".mjs",
-        ".cjs",
-        ".jsx",
-        ".ts",
-        ".mts",
-        ".cts",
-        ".tsx",
-        ".html",
-        ".htm",
-        ".css",
-        ".scss",
-        ".sass",
-        ".less",
-        ".java",
-        ".kt",
-        ".kts",
-        ".dart",
-        ".cs",
-        ".cpp",
-        ".cc",
-        ".cxx",
-        ".c",
-        ".h",
-        ".hpp",
-        ".m",
-        ".mm",
-        ".go",
-        ".rs",
-        ".php",
-        ".rb",
-        ".swift",
-        ".scala",
-        ".groovy",
-        ".gradle",
-        ".fs",
-        ".fsi",
-        ".fsx",
-        ".vb",
-        ".vbs",
-        ".r",
-        ".rmd",
-        ".jl",
-        ".lua",
-        ".ex",
-        ".exs",
-        ".erl",
-        ".hrl",
-        ".clj",
-        ".cljs",
-        ".cljc",
-        ".hs",
-        ".elm",
-        ".ml",
-        ".mli",
-        ".pl",
-        ".pm",
-        ".sbt",
-        ".sc",
-        ".nim",
-        ".zig",
-        ".sol",
-        ".proto",
-        ".tf",
-        ".hcl",
-        ".ps1",
-        ".psm1",
-        ".psd1",
-        ".bat",
-        ".cmd",
-        ".bash",
-        ".zsh",
-        ".fish",
-        ".vue",
-        ".svelte",
-        ".sql",
-        ".sh",
-        ".pt",
-    }
-    LINE_COUNT_FILENAMES = {
-        "dockerfile",
-        "makefile",
-        "cmakelists.txt",
-        "jenkinsfile",
-        "justfile",
-    }
+    LINE_COUNT_EXTENSIONS = frozenset(
+        {
+            ".py",
+            ".js",
+            ".mjs",
+            ".cjs",
+            ".jsx",
+            ".ts",
+            ".mts",
+            ".cts",
+            ".tsx",
+            ".html",
+            ".htm",
+            ".css",
+            ".scss",
+            ".sass",
+            ".less",
+            ".java",
+            ".kt",
+            ".kts",
+            ".dart",
+            ".cs",
+            ".cpp",
+            ".cc",
+            ".cxx",
+            ".c",
+            ".h",
+            ".hpp",
+            ".m",
+            ".mm",
+            ".go",
+            ".rs",
+            ".php",
+            ".rb",
+            ".swift",
+            ".scala",
+            ".groovy",
+            ".gradle",
+            ".fs",
+            ".fsi",
+            ".fsx",
+            ".vb",
+            ".vbs",
+            ".r",
+            ".rmd",
+            ".jl",
+            ".lua",
+            ".ex",
+            ".exs",
+            ".erl",
+            ".hrl",
+            ".clj",
+            ".cljs",
+            ".cljc",
+            ".hs",
+            ".elm",
+            ".ml",
+            ".mli",
+            ".pl",
+            ".pm",
+            ".sbt",
+            ".sc",
+            ".nim",
+            ".zig",
+            ".sol",
+            ".proto",
+            ".tf",
+            ".hcl",
+            ".ps1",
+            ".psm1",
+            ".psd1",
+            ".bat",
+            ".cmd",
+            ".bash",
+            ".zsh",
+            ".fish",
+            ".vue",
+            ".svelte",
+            ".sql",
+            ".sh",
+            ".pt",
+        }
+    )
+    LINE_COUNT_FILENAMES = frozenset(
+        {
+            "dockerfile",
+            "makefile",
+            "cmakelists.txt",
+            "jenkinsfile",
+            "justfile",
+        }
+    )
+    # Important files are classified with set membership plus tuple `startswith`;
+    # a combined regex alternation measured ~1.5x slower on large trees.
+    IMPORTANT_FILENAMES = frozenset(
+        {
+            "contributing.md",
+            "pyproject.toml",
+            ".pre-commit-config.yaml",
+            ".env.example",
+            "package.json",
+            "pom.xml",
+            "build.gradle",
+            "build.gradle.kts",
+            "directory.build.props",
+            "stylecop.json",
+            ".editorconfig",
+            "requirements.txt",
+            "requirements-dev.txt",
+            "poetry.lock",
+            "pdm.lock",
+            "package-lock.json",
+            "pnpm-lock.yaml",
+            "yarn.lock",
+            "cargo.toml",
+            "cargo.lock",
+            "go.mod",
+            "go.sum",
+            "gemfile",
+            "gemfile.lock",
+            "composer.json",
+            "composer.lock",
+            "pubspec.yaml",
+            "pubspec.lock",
+            "analysis_options.yaml",
+            "dart_test.yaml",
+            "security.md",
+            "codeowners",
+            ".repo-inspector.yml",
+            ".repo-inspector.yaml",
+            "repo-inspector.yml",
+            "repo-inspector.yaml",
+        }
+    )
+    IMPORTANT_FILENAME_PREFIXES = ("readme.", "license")
+    IMPORTANT_PATH_PREFIXES = (".github/issue_template/", ".github/pull_request_template")
+    IMPORTANT_PATHS = frozenset({".github/dependabot.yml"})
+    WORKFLOW_PATH_PREFIX = ".github/workflows/"
+    WORKFLOW_SUFFIXES = (".yml", ".yaml")
     MAX_LINE_COUNT_FILES = 450
     MAX_LINE_COUNT_FILE_SIZE = 220_000
     MAX_CONCURRENT_FILE_FETCHES = 24
+    GRAPHQL_FILE_BATCH_SIZE = 50
+    MAX_TRUNCATED_TREE_REQUESTS = 50
+    RAW_MEDIA_TYPE = "application/vnd.github.raw"
 
     def __init__(self, token: str | None = None) -> None:
         """Create client with optional per-request token override."""
 
-        settings = get_settings()
-        self.base_url = settings.github_api_base.rstrip("/")
+        self.base_url = SETTINGS.github_api_base.rstrip("/")
+        self.graphql_url = self._graphql_url(self.base_url)
         runtime_token = token.strip() if isinstance(token, str) else None
-        self.token = runtime_token or settings.github_app_token or settings.github_token
+        self.token = runtime_token or SETTINGS.github_app_token or SETTINGS.github_token
         self.headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
@@ -176,6 +237,33 @@ class GitHubClient:
         }
         if self.token:
             self.headers["Authorization"] = f"Bearer {self.token}"
+        self._client: httpx.AsyncClient | None = None
+        # Shared by every file fetch of this client so one scan never exceeds the cap.
+        self._fetch_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FILE_FETCHES)
+
+    async def __aenter__(self) -> "GitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections held by this client."""
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return shared HTTP client so sequential calls reuse TCP/TLS connections."""
+
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(20.0),
+                headers=self.headers,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+        return self._client
 
     async def check_repo_access(self, owner: str, repo: str) -> None:
         """Validate repository visibility and token access."""
@@ -186,20 +274,22 @@ class GitHubClient:
         """Perform one GitHub API request with consistent error handling."""
 
         url = f"{self.base_url}{path}"
-        timeout = httpx.Timeout(20.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            try:
-                response = await client.request(method, url, headers=self.headers, params=params)
-            except httpx.HTTPError as exc:
-                detail = self._http_error_detail(exc)
-                raise GitHubAPIError(f"GitHub request failed: {detail}") from exc
+        client = self._get_client()
+        try:
+            response = await client.request(method, url, params=params)
+        except httpx.HTTPError as exc:
+            detail = self._http_error_detail(exc)
+            raise GitHubAPIError(f"GitHub request failed: {detail}") from exc
 
         payload: Any = None
         try:
-            payload = response.json()
-        except ValueError:
+            payload = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             payload = None
 
+        if self._is_rate_limited(response):
+            detail = payload.get("message") if isinstance(payload, dict) else "API rate limit exceeded."
+            raise GitHubRateLimitError(f"GitHub API error ({response.status_code}): {detail}")
         if response.status_code in (401, 403):
             detail = (
                 payload.get("message")
@@ -242,6 +332,34 @@ class GitHubClient:
             return "GitHub API request timed out."
         return f"{exc.__class__.__name__} while contacting GitHub API."
 
+    @staticmethod
+    def _graphql_url(base_url: str) -> str:
+        """Return the GraphQL endpoint for a REST API base.
+
+        GitHub Enterprise Server serves REST under `/api/v3` but GraphQL at
+        `/api/graphql`, whereas api.github.com serves both from the root.
+        """
+
+        if base_url.endswith("/v3"):
+            return f"{base_url[:-3]}/graphql"
+        return f"{base_url}/graphql"
+
+    @staticmethod
+    def _unwrap(result: Any) -> Any:
+        """Return one `asyncio.gather(..., return_exceptions=True)` result or re-raise it."""
+
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    @staticmethod
+    def _is_rate_limited(response: httpx.Response) -> bool:
+        """Detect primary/secondary rate-limit rejections from GitHub."""
+
+        if response.status_code == 429:
+            return True
+        return response.status_code == 403 and response.headers.get("x-ratelimit-remaining") == "0"
+
     @staticmethod
     def _parse_dt(value: str | None) -> datetime | None:
         """Parse ISO8601 timestamp from GitHub payload."""
@@ -259,6 +377,12 @@ class GitHubClient:
         except (TypeError, ValueError):
             return default
 
+    @staticmethod
+    def _str_or_none(value: object) -> str | None:
+        """Return string values unchanged and drop everything else."""
+
+        return value if isinstance(value, str) else None
+
     async def get_repo_snapshot(
         self,
         owner: str,
@@ -271,51 +395,59 @@ class GitHubClient:
         default_branch = repo_data.get("default_branch")
         if not default_branch:
             raise GitHubAPIError("Repository default branch is not available.")
+        has_license = bool(repo_data.get("license"))
+        # Everything below depends only on the default branch, so fetch it concurrently.
+        pending = [
+            self._request("GET", f"/repos/{owner}/{repo}/branches/{default_branch}"),
+            self._request(
+                "GET",
+                f"/repos/{owner}/{repo}/git/trees/{default_branch}",
+                params={"recursive": 1},
+            ),
+            self._request("GET", f"/repos/{owner}/{repo}/releases", params={"per_page": 1}),
+            self._request("GET", f"/repos/{owner}/{repo}/tags", params={"per_page": 1}),
+        ]
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        branch_data = None if isinstance(results[0], GitHubAPIError) else self._unwrap(results[0])
+        tree, release_data, tags_data = (self._unwrap(item) for item in results[1:4])
+
         default_branch_sha: str | None = None
-        try:
-            branch_data = await self._request("GET", f"/repos/{owner}/{repo}/branches/{default_branch}")
-            commit_data = branch_data.get("commit", {}) if isinstance(branch_data, dict) else {}
-            sha = commit_data.get("sha")
+        if isinstance(branch_data, dict):
+            commit_data = branch_data.get("commit", {})
+            sha = commit_data.get("sha") if isinstance(commit_data, dict) else None
             if isinstance(sha, str):
                 default_branch_sha = sha
-        except GitHubAPIError:
-            default_branch_sha = None
 
-        tree = await self._request(
-            "GET",
-            f"/repos/{owner}/{repo}/git/trees/{default_branch}",
-            params={"recursive": 1},
-        )
         tree_items = tree.get("tree", [])
-        tree_paths = [item["path"] for item in tree_items if item.get("type") == "blob" and "path" in item]
-        path_sizes = {
-            item["path"]: int(item.get("size", 0))
-            for item in tree_items
-            if item.get("type") == "blob" and "path" in item
-        }
-
-        workflow_paths = [
-            path
-            for path in tree_paths
-            if path.lower().startswith(".github/workflows/") and path.lower().endswith((".yml", ".yaml"))
-        ]
+        if tree.get("truncated"):
+            tree_items = await self._walk_truncated_tree(owner, repo, default_branch, tree_items)
+
+        # (path, lowercased path, size) per blob, shared by the file pickers below.
+        blobs: list[tuple[str, str, int]] = []
+        workflow_paths: list[str] = []
+        workflow_prefix = self.WORKFLOW_PATH_PREFIX
+        workflow_suffixes = self.WORKFLOW_SUFFIXES
+        for item in tree_items:
+            if item.get("type") != "blob" or "path" not in item:
+                continue
+            path = item["path"]
+            lower = path.lower()
+            blobs.append((path, lower, int(item.get("size", 0))))
+            if lower.startswith(workflow_prefix) and lower.endswith(workflow_suffixes):
+                workflow_paths.append(path)
+        tree_paths = [blob[0] for blob in blobs]
 
-        release_data = await self._request("GET", f"/repos/{owner}/{repo}/releases", params={"per_page": 1})
-        tags_data = await self._request("GET", f"/repos/{owner}/{repo}/tags", params={"per_page": 1})
         has_release_or_tag = bool(release_data) or bool(tags_data)
 
-        has_license = bool(repo_data.get("license"))
         if not has_license:
-            try:
-                await self._request("GET", f"/repos/{owner}/{repo}/license")
-                has_license = True
-            except GitHubAPIError:
-                has_license = False
+            has_license = any(
+                "/" not in lower and lower.startswith("license") for _, lower, _ in blobs
+            ) or await self._has_license_endpoint(owner, repo)
 
-        line_count_paths, line_count_candidates_total = self._pick_line_count_files(tree_paths, path_sizes)
+        line_count_paths, line_count_candidates_total = self._pick_line_count_files(blobs)
         line_count_paths = self._apply_line_count_fetch_limit(line_count_paths, line_count_fetch_limit)
         line_count_sampled = line_count_candidates_total > len(line_count_paths)
-        important_files = self._pick_important_files(tree_paths, workflow_paths, line_count_paths)
+        important_files = self._pick_important_files(blobs, workflow_paths, line_count_paths)
         file_contents = await self._fetch_files(owner, repo, important_files, default_branch)
 
         return RepoSnapshot(
@@ -336,6 +468,93 @@ class GitHubClient:
             line_count_sampled=line_count_sampled,
         )
 
+    async def _has_license_endpoint(self, owner: str, repo: str) -> bool:
+        """Probe the license endpoint with HEAD; only the status code matters."""
+
+        try:
+            response = await self._get_client().head(f"{self.base_url}/repos/{owner}/{repo}/license")
+        except httpx.HTTPError:
+            return False
+        if self._is_rate_limited(response):
+            raise GitHubRateLimitError(f"GitHub API error ({response.status_code}): API rate limit exceeded.")
+        return response.status_code == 200
+
+    async def _walk_truncated_tree(
+        self,
+        owner: str,
+        repo: str,
+        ref: str,
+        truncated_items: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Rebuild blob entries when GitHub truncates the recursive tree listing.
+
+        The root is listed non-recursively and each top-level subtree is then
+        fetched recursively; subtrees that are still truncated are expanded one
+        level further. The number of requests is capped to protect rate limits.
+        Directories whose request failed or did not fit in the budget keep the
+        blobs of the original `truncated_items`, so the walk never loses paths.
+        """
+
+        items: list[dict[str, Any]] = []
+        # Prefixes whose whole subtree is in `items`, and prefixes whose direct blobs are.
+        complete_prefixes: set[str] = set()
+        listed_dirs: set[str] = set()
+        pending: list[tuple[str, str, bool]] = [(ref, "", False)]
+        budget = self.MAX_TRUNCATED_TREE_REQUESTS
+        while pending and budget > 0:
+            batch, pending = pending[:budget], pending[budget:]
+            budget -= len(batch)
+            results = await asyncio.gather(
+                *(
+                    self._request(
+                        "GET",
+                        f"/repos/{owner}/{repo}/git/trees/{sha}",
+                        params={"recursive": 1} if recursive else None,
+                    )
+                    for sha, _, recursive in batch
+                ),
+                return_exceptions=True,
+            )
+            for (sha, prefix, recursive), result in zip(batch, results, strict=True):
+                if isinstance(result, GitHubAPIError):
+                    continue
+                result = self._unwrap(result)
+                if not isinstance(result, dict):
+                    continue
+                if recursive and result.get("truncated"):
+                    pending.append((sha, prefix, False))
+                    continue
+                (complete_prefixes if recursive else listed_dirs).add(prefix)
+                for entry in result.get("tree", []):
+                    if not isinstance(entry, dict) or "path" not in entry:
+                        continue
+                    path = f"{prefix}{entry['path']}"
+                    if entry.get("type") == "blob":
+                        items.append({**entry, "path": path})
+                    elif entry.get("type") == "tree" and not recursive and entry.get("sha"):
+                        pending.append((entry["sha"], f"{path}/", True))
+
+        for entry in truncated_items:
+            if not isinstance(entry, dict) or entry.get("type") != "blob" or "path" not in entry:
+                continue
+            if not self._is_walked_path(entry["path"], complete_prefixes, listed_dirs):
+                items.append(entry)
+        return items
+
+    @staticmethod
+    def _is_walked_path(path: str, complete_prefixes: set[str], listed_dirs: set[str]) -> bool:
+        """Return whether the tree walk already produced the blob at `path`."""
+
+        directory = path.rpartition("/")[0]
+        if (f"{directory}/" if directory else "") in listed_dirs:
+            return True
+        index = path.find("/")
+        while index >= 0:
+            if path[: index + 1] in complete_prefixes:
+                return True
+            index = path.find("/", index + 1)
+        return False
+
     async def get_changed_files_between_commits(
         self,
         owner: str,
@@ -362,10 +581,14 @@ class GitHubClient:
         return changed[:max_files]
 
     async def get_repo_public_stats(self, owner: str, repo: str) -> RepoPublicStats:
-        repo_data = await self._request("GET", f"/repos/{owner}/{repo}")
-        languages_raw = await self._request("GET", f"/repos/{owner}/{repo}/languages")
-        release_data = await self._request("GET", f"/repos/{owner}/{repo}/releases", params={"per_page": 1})
-        tags_data = await self._request("GET", f"/repos/{owner}/{repo}/tags", params={"per_page": 1})
+        results = await asyncio.gather(
+            self._request("GET", f"/repos/{owner}/{repo}"),
+            self._request("GET", f"/repos/{owner}/{repo}/languages"),
+            self._request("GET", f"/repos/{owner}/{repo}/releases", params={"per_page": 1}),
+            self._request("GET", f"/repos/{owner}/{repo}/tags", params={"per_page": 1}),
+            return_exceptions=True,
+        )
+        repo_data, languages_raw, release_data, tags_data = (self._unwrap(item) for item in results)
 
         languages: dict[str, int] = {}
         if isinstance(languages_raw, dict):
@@ -386,123 +609,74 @@ class GitHubClient:
         license_data = repo_data.get("license")
         license_name = None
         if isinstance(license_data, dict):
-            maybe = license_data.get("spdx_id") or license_data.get("name")
-            if isinstance(maybe, str):
-                license_name = maybe
+            license_name = self._str_or_none(license_data.get("spdx_id") or license_data.get("name"))
 
+        safe_int = self._safe_int
+        parse_dt = self._parse_dt
+        str_or_none = self._str_or_none
         return RepoPublicStats(
             owner=owner,
             name=repo,
             full_name=str(repo_data.get("full_name", f"{owner}/{repo}")),
             html_url=str(repo_data.get("html_url", f"https://github.com/{owner}/{repo}")),
-            description=repo_data.get("description")
-            if isinstance(repo_data.get("description"), str)
-            else None,
-            stars=self._safe_int(repo_data.get("stargazers_count")),
-            forks=self._safe_int(repo_data.get("forks_count")),
-            open_issues=self._safe_int(repo_data.get("open_issues_count")),
-            watchers=self._safe_int(repo_data.get("subscribers_count", repo_data.get("watchers_count", 0))),
+            description=str_or_none(repo_data.get("description")),
+            stars=safe_int(repo_data.get("stargazers_count")),
+            forks=safe_int(repo_data.get("forks_count")),
+            open_issues=safe_int(repo_data.get("open_issues_count")),
+            watchers=safe_int(repo_data.get("subscribers_count", repo_data.get("watchers_count", 0))),
             default_branch=str(repo_data.get("default_branch", "main")),
-            primary_language=(
-                repo_data.get("language") if isinstance(repo_data.get("language"), str) else None
-            ),
+            primary_language=str_or_none(repo_data.get("language")),
             license_name=license_name,
             topics=[str(item) for item in topics[:20]],
             archived=bool(repo_data.get("archived", False)),
             is_fork=bool(repo_data.get("fork", False)),
-            size_kb=self._safe_int(repo_data.get("size")),
-            created_at=self._parse_dt(repo_data.get("created_at")),
-            updated_at=self._parse_dt(repo_data.get("updated_at")),
-            pushed_at=self._parse_dt(repo_data.get("pushed_at")),
-            homepage=repo_data.get("homepage") if isinstance(repo_data.get("homepage"), str) else None,
+            size_kb=safe_int(repo_data.get("size")),
+            created_at=parse_dt(repo_data.get("created_at")),
+            updated_at=parse_dt(repo_data.get("updated_at")),
+            pushed_at=parse_dt(repo_data.get("pushed_at")),
+            homepage=str_or_none(repo_data.get("homepage")),
             has_releases=bool(release_data),
             has_tags=bool(tags_data),
             languages=languages,
         )
 
-    @staticmethod
+    @classmethod
     def _pick_important_files(
-        tree_paths: list[str],
+        cls,
+        blobs: list[tuple[str, str, int]],
         workflow_paths: list[str],
         line_count_paths: list[str],
     ) -> list[str]:
+        exact_filenames = cls.IMPORTANT_FILENAMES
+        filename_prefixes = cls.IMPORTANT_FILENAME_PREFIXES
+        path_prefixes = cls.IMPORTANT_PATH_PREFIXES
+        exact_paths = cls.IMPORTANT_PATHS
         important = set(workflow_paths)
         important.update(line_count_paths)
-        for path in tree_paths:
-            lower = path.lower()
-            filename = lower.split("/")[-1]
-            if filename.startswith("readme."):
-                important.add(path)
-            if filename == "contributing.md":
-                important.add(path)
-            if filename.startswith("license"):
-                important.add(path)
-            if filename == "pyproject.toml":
-                important.add(path)
-            if filename == ".pre-commit-config.yaml":
-                important.add(path)
-            if filename == ".env.example":
-                important.add(path)
-            if filename == "package.json":
-                important.add(path)
-            if filename in {"pom.xml", "build.gradle", "build.gradle.kts"}:
-                important.add(path)
-            if filename in {"directory.build.props", "stylecop.json", ".editorconfig"}:
-                important.add(path)
-            if filename in {
-                "requirements.txt",
-                "requirements-dev.txt",
-                "poetry.lock",
-                "pdm.lock",
-                "package-lock.json",
-                "pnpm-lock.yaml",
-                "yarn.lock",
-                "cargo.toml",
-                "cargo.lock",
-                "go.mod",
-                "go.sum",
-                "gemfile",
-                "gemfile.lock",
-                "composer.json",
-                "composer.lock",
-                "pubspec.yaml",
-                "pubspec.lock",
-                "analysis_options.yaml",
-                "dart_test.yaml",
-            }:
-                important.add(path)
-            if filename in {"security.md", "codeowners"}:
-                important.add(path)
-            if lower.startswith(".github/issue_template/"):
-                important.add(path)
-            if lower.startswith(".github/pull_request_template"):
-                important.add(path)
-            if lower == ".github/dependabot.yml":
-                important.add(path)
-            if filename in {
-                ".repo-inspector.yml",
-                ".repo-inspector.yaml",
-                "repo-inspector.yml",
-                "repo-inspector.yaml",
-            }:
+        for path, lower, _ in blobs:
+            filename = lower.rpartition("/")[2]
+            if (
+                filename in exact_filenames
+                or filename.startswith(filename_prefixes)
+                or lower.startswith(path_prefixes)
+                or lower in exact_paths
+            ):
                 important.add(path)
         return sorted(important)
 
-    def _pick_line_count_files(
-        self,
-        tree_paths: list[str],
-        path_sizes: dict[str, int],
-    ) -> tuple[list[str], int]:
+    def _pick_line_count_files(self, blobs: list[tuple[str, str, int]]) -> tuple[list[str], int]:
+        extensions = self.LINE_COUNT_EXTENSIONS
+        filenames = self.LINE_COUNT_FILENAMES
+        max_size = self.MAX_LINE_COUNT_FILE_SIZE
         candidates: list[str] = []
-        for path in tree_paths:
-            lower = path.lower()
-            filename = lower.split("/")[-1]
+        for path, lower, size in blobs:
+            filename = lower.rpartition("/")[2]
             if filename.startswith("."):
                 continue
-            ext = self._extension(lower)
-            if ext not in self.LINE_COUNT_EXTENSIONS and filename not in self.LINE_COUNT_FILENAMES:
+            _, dot, ext_tail = filename.rpartition(".")
+            if not (dot and "." + ext_tail in extensions) and filename not in filenames:
                 continue
-            if path_sizes.get(path, 0) > self.MAX_LINE_COUNT_FILE_SIZE:
+            if size > max_size:
                 continue
             candidates.append(path)
         candidates = sorted(candidates)
@@ -523,39 +697,127 @@ class GitHubClient:
             return []
         return paths[:parsed]
 
-    @staticmethod
-    def _extension(path: str) -> str:
-        idx = path.rfind(".")
-        return path[idx:] if idx >= 0 else ""
-
     async def _fetch_files(self, owner: str, repo: str, paths: list[str], ref: str) -> dict[str, str]:
         contents: dict[str, str] = {}
         if not paths:
             return contents
-        async with httpx.AsyncClient(timeout=httpx.Timeout(20.0)) as client:
-            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FILE_FETCHES)
-            tasks = [
-                self._fetch_single_file_guarded(client, semaphore, owner, repo, path, ref)
-                for path in paths
-            ]
-            responses = await asyncio.gather(*tasks)
-
-        for path, response in zip(paths, responses, strict=False):
-            if response is None:
+        client = self._get_client()
+        fetched: dict[str, str] = {}
+        if self.token:
+            # GraphQL is only available to authenticated callers.
+            fetched = await self._fetch_files_graphql(client, owner, repo, paths, ref)
+
+        missing = [path for path in paths if path not in fetched]
+        # A rate-limit rejection cancels the remaining fetches instead of letting them fail one by one.
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self._fetch_single_file_guarded(client, owner, repo, path, ref))
+                    for path in missing
+                ]
+        except* GitHubRateLimitError as errors:
+            raise errors.exceptions[0] from None
+        for path, task in zip(missing, tasks, strict=True):
+            response = task.result()
+            if response is not None:
+                fetched[path] = response
+
+        for path in paths:
+            if path in fetched:
+                contents[path] = fetched[path]
+        return contents
+
+    async def _fetch_files_graphql(
+        self,
+        client: httpx.AsyncClient,
+        owner: str,
+        repo: str,
+        paths: list[str],
+        ref: str,
+    ) -> dict[str, str]:
+        """Fetch text blobs in batches of aliased GraphQL `object` lookups.
+
+        Paths missing from the result (binary, truncated or failed batches)
+        are left for the REST fallback.
+        """
+
+        size = self.GRAPHQL_FILE_BATCH_SIZE
+        chunks = [paths[start : start + size] for start in range(0, len(paths), size)]
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self._fetch_graphql_chunk(client, owner, repo, chunk, ref))
+                    for chunk in chunks
+                ]
+        except* GitHubRateLimitError as errors:
+            raise errors.exceptions[0] from None
+        contents: dict[str, str] = {}
+        for task in tasks:
+            contents.update(task.result())
+        return contents
+
+    async def _fetch_graphql_chunk(
+        self,
+        client: httpx.AsyncClient,
+        owner: str,
+        repo: str,
+        paths: list[str],
+        ref: str,
+    ) -> dict[str, str]:
+        declarations = ["$owner: String!", "$name: String!"]
+        fields: list[str] = []
+        variables: dict[str, str] = {"owner": owner, "name": repo}
+        for index, path in enumerate(paths):
+            declarations.append(f"$e{index}: String!")
+            fields.append(
+                f"f{index}: object(expression: $e{index}) {{ ... on Blob {{ text isBinary isTruncated }} }}"
+            )
+            variables[f"e{index}"] = f"{ref}:{path}"
+        query = (
+            f"query({', '.join(declarations)}) "
+            f"{{ repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}"
+        )
+
+        async with self._fetch_semaphore:
+            try:
+                response = await client.post(
+                    self.graphql_url,
+                    json={"query": query, "variables": variables},
+                )
+            except httpx.HTTPError:
+                return {}
+        if self._is_rate_limited(response):
+            raise GitHubRateLimitError("GitHub GraphQL API rate limit exceeded.")
+        if response.status_code >= 400:
+            return {}
+        try:
+            payload = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return {}
+        data = payload.get("data") if isinstance(payload, dict) else None
+        repository = data.get("repository") if isinstance(data, dict) else None
+        if not isinstance(repository, dict):
+            return {}
+
+        contents: dict[str, str] = {}
+        for index, path in enumerate(paths):
+            blob = repository.get(f"f{index}")
+            if not isinstance(blob, dict) or blob.get("isBinary") or blob.get("isTruncated"):
                 continue
-            contents[path] = response
+            text = blob.get("text")
+            if isinstance(text, str):
+                contents[path] = text
         return contents
 
     async def _fetch_single_file_guarded(
         self,
         client: httpx.AsyncClient,
-        semaphore: asyncio.Semaphore,
         owner: str,
         repo: str,
         path: str,
         ref: str,
     ) -> str | None:
-        async with semaphore:
+        async with self._fetch_semaphore:
             return await self._fetch_single_file(client, owner, repo, path, ref)
 
     async def _fetch_single_file(
@@ -566,19 +828,28 @@ class GitHubClient:
         path: str,
         ref: str,
     ) -> str | None:
+        url = f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
+        is_envelope = False
         try:
-            response = await client.get(
-                f"{self.base_url}/repos/{owner}/{repo}/contents/{path}",
-                headers=self.headers,
-                params={"ref": ref},
-            )
+            response = await client.get(url, params={"ref": ref}, headers={"Accept": self.RAW_MEDIA_TYPE})
+            if response.status_code == 415:
+                is_envelope = True
+                response = await client.get(url, params={"ref": ref})
         except httpx.HTTPError:
             return None
+        if self._is_rate_limited(response):
+            raise GitHubRateLimitError(f"GitHub API error ({response.status_code}): API rate limit exceeded.")
         if response.status_code >= 400:
             return None
+        # Only the 415 fallback returns the base64 JSON envelope; a raw `.json` file may
+        # still be labelled `application/json`, so the content type cannot decide this.
+        if not is_envelope:
+            return response.content.decode("utf-8", errors="replace")
         try:
-            payload = response.json()
-        except ValueError:
+            payload = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(payload, dict):
             return None
         encoded = payload.get("content")
         if not encoded or payload.get("encoding") != "base64":
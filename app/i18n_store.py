@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import json
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 APP_DIR = Path(__file__).resolve().parent
 TRANSLATIONS_PATH = APP_DIR / "locales" / "translations.json"
 
@@ -15,17 +16,21 @@ TRANSLATIONS_PATH = APP_DIR / "locales" / "translations.json"
 def load_translations() -> dict[str, Any]:
     """Read translations JSON and return validated mapping."""
 
-    # `utf-8-sig` supports both UTF-8 with and without BOM.
-    # This avoids mojibake in Windows editors that may re-save with BOM.
-    with TRANSLATIONS_PATH.open("r", encoding="utf-8-sig") as fp:
-        payload = json.load(fp)
+    # Strip an optional UTF-8 BOM: Windows editors may re-save the file with one,
+    # and orjson rejects it.
+    raw = TRANSLATIONS_PATH.read_bytes().removeprefix(b"\xef\xbb\xbf")
+    payload = orjson.loads(raw)
     if not isinstance(payload, dict):
         raise ValueError("translations.json root must be an object")
     return payload
 
 
+@lru_cache(maxsize=64)
 def get_translation_section(section: str) -> dict[str, Any]:
-    """Return one top-level section or an empty dictionary."""
+    """Return one top-level section or an empty dictionary.
+
+    Results are memoized per section and shared between callers, so treat them as read-only.
+    """
 
     payload = load_translations()
     raw = payload.get(section)
@@ -3,42 +3,88 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
+import io
+import multiprocessing
+import operator
 import os
 import re
+import threading
 import time
-from collections import defaultdict, deque
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Literal
 
+import orjson
 from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse, Response
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, field_validator
+from sqlalchemy import delete, literal_column, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.db import Base, SessionLocal, engine, ensure_sqlite_compat_schema, get_db
-from app.github_client import GitHubAPIError, GitHubClient, RepoPublicStats
+from app.github_client import (
+    GitHubAPIError,
+    GitHubClient,
+    GitHubRateLimitError,
+    RepoPublicStats,
+    RepoSnapshot,
+)
 from app.models import ScanJob, ScanReport
-from app.scanner.checks import detect_stacks, project_line_metrics, run_all_checks
+from app.scan_counters import SharedScanCounters
+from app.scanner.checks import (
+    TreeIndex,
+    close_osv_cache,
+    detect_stacks,
+    project_line_metrics,
+    run_all_checks,
+)
 from app.scanner.i18n import get_client_i18n, get_ui_labels, localize_report, normalize_lang
 from app.scanner.policy import RepoPolicy, load_repo_policy
-from app.scanner.schemas import CategoryDeltaItem, CheckDeltaItem, CheckResult, ReportComparison
-from app.scanner.scoring import build_report, check_weight_map
+from app.scanner.schemas import (
+    CategoryDeltaItem,
+    CheckDeltaItem,
+    CheckResult,
+    ProjectMetrics,
+    ReportComparison,
+)
+from app.scanner.scoring import STATUS_FACTOR, build_report, check_weight_map, compute_score_total
 from app.stats_card import build_quality_stats_svg, build_repo_stats_svg
 from app.theme_store import THEME_KEYS, get_custom_theme_defaults, get_theme_options
 
-GITHUB_REPO_RE = re.compile(r"^https?://github\.com/([^/\s]+)/([^/\s#]+?)(?:\.git)?/?$")
+GITHUB_URL_PREFIXES = ("https://github.com/", "http://github.com/")
 HEX_COLOR_RE = re.compile(r"^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$")
 APP_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(APP_DIR / "templates"))
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name, version="0.2.0")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(title=settings.app_name, version="0.2.0", default_response_class=ORJSONResponse)
 app.mount("/static", StaticFiles(directory=str(APP_DIR / "static")), name="static")
 app.add_middleware(
     CORSMiddleware,
@@ -49,23 +95,65 @@ app.add_middleware(
 )
 
 _RATE_WINDOW_SECONDS = 60
+_ZERO_BUCKETS = array("I", bytes(4 * _RATE_WINDOW_SECONDS))
 _REPO_STATS_CACHE_TTL_SECONDS = 300
 _QUALITY_LIVE_CACHE_TTL_SECONDS = 180
 _LIVE_SNAPSHOT_LINE_COUNT_FETCH_LIMIT = 120
-_scan_requests: dict[str, deque[float]] = defaultdict(deque)
-_scan_daily_usage: dict[str, tuple[date, int]] = {}
-_repo_stats_cache: dict[str, tuple[float, RepoPublicStats]] = {}
-_quality_live_cache: dict[str, tuple[float, dict[str, object]]] = {}
+# Sliding-window scan counters per identity in LRU order; idle identities are swept once per
+# window, and the size cap bounds memory when many distinct clients arrive within one window.
+_SCAN_WINDOWS_MAX_ENTRIES = 10_000
+# Daily counters hold only the current day and are cleared when it rolls over; within a day
+# they are kept in LRU order under the same cap as the sliding windows.
+_scan_daily_counts: OrderedDict[str, int] = OrderedDict()
+_scan_daily_bucket: date | None = None
+_scan_windows: OrderedDict[str, _SlidingWindowCounter] = OrderedDict()
+_scan_windows_swept_at = 0
+_shared_scan_counters: SharedScanCounters | None = None
+# Created on first use when `scan.cpu_workers` is set; see `_analyze_snapshot_offloaded`.
+_cpu_pool: ProcessPoolExecutor | None = None
+_cpu_pool_lock = threading.Lock()
+_STALE_SWEEP_INTERVAL_SECONDS = 60
+# Keeps bulk `IN (...)` deletes under SQLite's bound-parameter limit.
+_DELETE_CHUNK_SIZE = 500
+_PRUNABLE_STATUSES = frozenset(("done", "failed"))
+_STALE_JOB_ERROR = "Marked as failed automatically because this scan job became stale."
+_stale_sweep_task: asyncio.Task[None] | None = None
+# Expired entries stay until evicted: they are served when GitHub fails, so eviction is
+# by size (LRU) rather than by age.
+_REPO_STATS_CACHE_MAX_ENTRIES = 2048
+_repo_stats_cache: OrderedDict[str, tuple[float, RepoPublicStats]] = OrderedDict()
+# Live snapshots are cached serialized: callers localize them in place, so every hit
+# needs a private copy anyway, and one orjson parse is the cheapest way to get it.
+_QUALITY_LIVE_CACHE_MAX_ENTRIES = 1024
+_quality_live_cache: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+_REPORT_CACHE_MAX_ENTRIES = 256
+# Stored reports by job id: the parsed payload under "", localized variants keyed by
+# language and the stats-card quality summary. Scans finish in worker threads, hence the lock.
+_QUALITY_SUMMARY_VARIANT = "@quality"
+_report_cache: OrderedDict[str, dict[str, dict[str, object]]] = OrderedDict()
+_report_cache_lock = threading.Lock()
+_SVG_RENDER_CACHE_MAX_ENTRIES = 4096
+_svg_render_cache: OrderedDict[tuple[str, bytes, bytes], str] = OrderedDict()
 _started_at = time.time()
-_metrics: dict[str, float] = {
-    "http_requests_total": 0,
-    "http_request_errors_total": 0,
-    "scan_jobs_started_total": 0,
-    "scan_jobs_done_total": 0,
-    "scan_jobs_failed_total": 0,
-    "scan_jobs_cached_total": 0,
-    "github_api_errors_total": 0,
-}
+_METRIC_NAMES = (
+    "http_requests_total",
+    "http_request_errors_total",
+    "scan_jobs_started_total",
+    "scan_jobs_done_total",
+    "scan_jobs_failed_total",
+    "scan_jobs_cached_total",
+    "github_api_errors_total",
+)
+_metrics: dict[str, int] = dict.fromkeys(_METRIC_NAMES, 0)
+# Scan jobs bump counters from threadpool workers; `+=` on a dict item is not atomic.
+_metrics_lock = threading.Lock()
+# The exposition never changes shape: one bytes template, filled with the values per scrape.
+_metric_values = operator.itemgetter(*_METRIC_NAMES)
+_pool_checked_out: Callable[[], int] | None = getattr(engine.pool, "checkedout", None)
+_METRICS_TEMPLATE = b"".join(
+    f"# TYPE rqi_{name} counter\nrqi_{name} %d\n".encode() for name in _METRIC_NAMES
+) + (b"# TYPE rqi_db_pool_checked_out gauge\nrqi_db_pool_checked_out %d\n" if _pool_checked_out else b"")
+_IS_VERCEL_RUNTIME = bool(os.getenv("VERCEL"))
 _PAGES_HOME_URL = os.getenv("RQI_PUBLIC_WEB_URL", "https://overl1te.github.io/Repo-Inspector/")
 _PAGES_GENERATOR_URL = os.getenv(
     "RQI_PUBLIC_GENERATOR_URL",
@@ -73,6 +161,30 @@ _PAGES_GENERATOR_URL = os.getenv(
 )
 
 
+# Memoized so `start_scan` reuses the split already done by `ScanRequest` validation.
+@lru_cache(maxsize=256)
+def _split_github_repo_url(value: str) -> tuple[str, str] | None:
+    """Split `https://github.com/<owner>/<repo>[.git][/]` into owner and repo."""
+
+    for prefix in GITHUB_URL_PREFIXES:
+        if value.startswith(prefix):
+            rest = value[len(prefix) :]
+            break
+    else:
+        return None
+    if rest.endswith("/"):
+        rest = rest[:-1]
+    owner, _, repo = rest.partition("/")
+    if repo.endswith(".git") and len(repo) > 4:
+        repo = repo[:-4]
+    if not owner or not repo or "/" in repo or "#" in repo:
+        return None
+    # `str.split()` returns the string itself only when it holds no whitespace.
+    if owner.split() != [owner] or repo.split() != [repo]:
+        return None
+    return owner, repo
+
+
 class ScanRequest(BaseModel):
     """Request body for creating a new scan job."""
 
@@ -82,9 +194,10 @@ class ScanRequest(BaseModel):
     @field_validator("repo_url")
     @classmethod
     def validate_repo_url(cls, value: str) -> str:
-        if not GITHUB_REPO_RE.match(value.strip()):
+        value = value.strip()
+        if _split_github_repo_url(value) is None:
             raise ValueError("URL must be in format https://github.com/<owner>/<repo>")
-        return value.strip()
+        return value
 
     @field_validator("github_token")
     @classmethod
@@ -95,33 +208,117 @@ class ScanRequest(BaseModel):
         return token or None
 
 
+def custom_theme_params(
+    bg_start: str | None = Query(default=None),
+    bg_end: str | None = Query(default=None),
+    border: str | None = Query(default=None),
+    panel: str | None = Query(default=None),
+    overlay: str | None = Query(default=None),
+    chip_bg: str | None = Query(default=None),
+    chip_text: str | None = Query(default=None),
+    text: str | None = Query(default=None),
+    muted: str | None = Query(default=None),
+    accent: str | None = Query(default=None),
+    accent_2: str | None = Query(default=None),
+    accent_soft: str | None = Query(default=None),
+    track: str | None = Query(default=None),
+    pass_color: str | None = Query(default=None, alias="pass"),
+    warn: str | None = Query(default=None),
+    fail: str | None = Query(default=None),
+) -> dict[str, str] | None:
+    """Collect the shared SVG color override query params into a custom theme."""
+
+    return _collect_custom_theme(
+        {
+            "bg_start": bg_start,
+            "bg_end": bg_end,
+            "border": border,
+            "panel": panel,
+            "overlay": overlay,
+            "chip_bg": chip_bg,
+            "chip_text": chip_text,
+            "text": text,
+            "muted": muted,
+            "accent": accent,
+            "accent_2": accent_2,
+            "accent_soft": accent_soft,
+            "track": track,
+            "pass": pass_color,
+            "warn": warn,
+            "fail": fail,
+        }
+    )
+
+
 @app.on_event("startup")
 def on_startup() -> None:
-    """Initialize DB schema and compatibility migrations."""
+    """Initialize DB schema, compatibility migrations and shared scan counters."""
+
+    global _shared_scan_counters
 
     Base.metadata.create_all(bind=engine)
     ensure_sqlite_compat_schema()
+    if settings.scan_shared_counters and _shared_scan_counters is None:
+        try:
+            _shared_scan_counters = SharedScanCounters(settings.scan_shared_counters)
+        except OSError:
+            # No shared memory (e.g. serverless sandbox): keep the per-process counters.
+            _shared_scan_counters = None
+
+
+@app.on_event("startup")
+async def start_stale_job_sweeper() -> None:
+    """Fail stale queued/running jobs once a minute instead of on every scan request."""
+
+    global _stale_sweep_task
+
+    if _stale_sweep_task is None:
+        _stale_sweep_task = asyncio.create_task(_stale_job_sweeper())
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    """Stop the stale job sweeper and check worker processes; release counters and the OSV cache."""
+
+    global _cpu_pool, _shared_scan_counters, _stale_sweep_task
+
+    if _stale_sweep_task is not None:
+        _stale_sweep_task.cancel()
+        _stale_sweep_task = None
+    with _cpu_pool_lock:
+        pool, _cpu_pool = _cpu_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    if _shared_scan_counters is not None:
+        _shared_scan_counters.close()
+        _shared_scan_counters = None
+    close_osv_cache()
+
+
+def _increment_metric(name: str) -> None:
+    with _metrics_lock:
+        _metrics[name] += 1
 
 
 @app.middleware("http")
 async def collect_http_metrics(request: Request, call_next: Any) -> Any:
     """Collect basic request/exception counters for `/metrics`."""
 
-    _metrics["http_requests_total"] += 1
+    _increment_metric("http_requests_total")
     try:
         return await call_next(request)
     except Exception:
-        _metrics["http_request_errors_total"] += 1
+        _increment_metric("http_request_errors_total")
         raise
 
 
 def parse_repo_url(repo_url: str) -> tuple[str, str]:
     """Parse repository owner/name from GitHub URL."""
 
-    match = GITHUB_REPO_RE.match(repo_url.strip())
-    if not match:
+    parts = _split_github_repo_url(repo_url.strip())
+    if parts is None:
         raise ValueError("Invalid GitHub repository URL.")
-    return match.group(1), match.group(2)
+    return parts
 
 
 def site_template_context() -> dict[str, str]:
@@ -134,15 +331,12 @@ def site_template_context() -> dict[str, str]:
     }
 
 
-def _is_vercel_runtime() -> bool:
-    return bool(os.getenv("VERCEL"))
-
-
 def _lang_url(url: str, lang: str) -> str:
     separator = "&" if "?" in url else "?"
     return f"{url}{separator}lang={lang}"
 
 
+@lru_cache(maxsize=32)
 def _backend_landing_page(lang: str) -> str:
     home_url = _lang_url(_PAGES_HOME_URL, lang)
     generator_url = _lang_url(_PAGES_GENERATOR_URL, lang)
@@ -227,7 +421,7 @@ def _backend_landing_page(lang: str) -> str:
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request, lang: str = "en") -> HTMLResponse:
     lang = normalize_lang(lang)
-    if _is_vercel_runtime():
+    if _IS_VERCEL_RUNTIME:
         return HTMLResponse(content=_backend_landing_page(lang))
     return templates.TemplateResponse(
         "index.html",
@@ -244,7 +438,7 @@ async def index(request: Request, lang: str = "en") -> HTMLResponse:
 @app.get("/generator", response_class=HTMLResponse)
 async def svg_generator(request: Request, lang: str = "en") -> HTMLResponse:
     lang = normalize_lang(lang)
-    if _is_vercel_runtime():
+    if _IS_VERCEL_RUNTIME:
         return RedirectResponse(url=_lang_url(_PAGES_GENERATOR_URL, lang), status_code=307)
     ui = get_ui_labels(lang)
     themes = get_theme_options(ui)
@@ -270,7 +464,11 @@ async def progress_page(
     db: Session = Depends(get_db),
 ) -> HTMLResponse:
     lang = normalize_lang(lang)
-    job = db.get(ScanJob, job_id)
+    job = (
+        db.query(ScanJob.id, ScanJob.repo_owner, ScanJob.repo_name, ScanJob.status, ScanJob.progress)
+        .filter(ScanJob.id == job_id)
+        .first()
+    )
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return templates.TemplateResponse(
@@ -297,24 +495,13 @@ async def start_scan(
 
     _enforce_scan_access_limits(request)
     owner, repo = parse_repo_url(payload.repo_url)
-    _expire_stale_active_jobs(db, owner, repo)
-
-    active_job = (
-        db.query(ScanJob)
-        .filter(
-            ScanJob.repo_owner == owner,
-            ScanJob.repo_name == repo,
-            ScanJob.status.in_(["queued", "running"]),
-        )
-        .order_by(ScanJob.created_at.desc())
-        .first()
-    )
+    active_job = _current_active_job(db, owner, repo)
     if active_job:
-        return {"job_id": active_job.id, "status": active_job.status}
+        return {"job_id": active_job[0], "status": active_job[1]}
 
     try:
-        access_client = GitHubClient(token=payload.github_token)
-        await access_client.check_repo_access(owner, repo)
+        async with GitHubClient(token=payload.github_token) as access_client:
+            await access_client.check_repo_access(owner, repo)
     except GitHubAPIError as exc:
         if _is_github_not_found_error(exc):
             raise HTTPException(
@@ -330,7 +517,7 @@ async def start_scan(
     db.add(job)
     db.commit()
     db.refresh(job)
-    _metrics["scan_jobs_started_total"] += 1
+    _increment_metric("scan_jobs_started_total")
     background_tasks.add_task(run_scan_job, job.id, payload.github_token)
     return {"job_id": job.id, "status": job.status}
 
@@ -338,7 +525,7 @@ async def start_scan(
 @app.get("/api/jobs/{job_id}")
 async def get_job_status(job_id: str, lang: str = "en", db: Session = Depends(get_db)) -> JSONResponse:
     lang = normalize_lang(lang)
-    job = db.get(ScanJob, job_id)
+    job = _job_row_with_report(db, job_id, ScanJob.status, ScanJob.progress, ScanJob.error_message)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     result: dict[str, object] = {
@@ -347,8 +534,8 @@ async def get_job_status(job_id: str, lang: str = "en", db: Session = Depends(ge
         "progress": job.progress,
         "error_message": job.error_message,
     }
-    if job.status == "done" and job.report:
-        report_payload = localize_report(json.loads(job.report.report_json), lang)
+    if job.status == "done" and job.report_json is not None:
+        report_payload = _get_localized_report(job.id, job.report_json, lang)
         result["summary"] = {
             "repo_url": report_payload.get("repo_url"),
             "score_total": report_payload.get("score_total"),
@@ -357,7 +544,7 @@ async def get_job_status(job_id: str, lang: str = "en", db: Session = Depends(ge
         }
         result["report_url"] = f"/report/{job.id}?lang={lang}"
         result["report_json_url"] = f"/api/report/{job.id}.json?lang={lang}"
-    return JSONResponse(result)
+    return ORJSONResponse(result)
 
 
 @app.get("/report/{job_id}", response_class=HTMLResponse)
@@ -368,13 +555,13 @@ async def report_page(
     db: Session = Depends(get_db),
 ) -> HTMLResponse:
     lang = normalize_lang(lang)
-    job = db.get(ScanJob, job_id)
+    job = _job_row_with_report(db, job_id, ScanJob.repo_owner, ScanJob.repo_name, ScanJob.status)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    if job.status != "done" or not job.report:
+    if job.status != "done" or job.report_json is None:
         return RedirectResponse(url=f"/jobs/{job_id}?lang={lang}", status_code=302)
 
-    report = localize_report(json.loads(job.report.report_json), lang)
+    report = _get_localized_report(job.id, job.report_json, lang)
     history = _repo_history(db, job.repo_owner, job.repo_name, limit=30)
     return templates.TemplateResponse(
         "report.html",
@@ -383,7 +570,7 @@ async def report_page(
             "job": job,
             "report": report,
             "history": history,
-            "history_json": json.dumps(history),
+            "history_json": orjson.dumps(history).decode(),
             "lang": lang,
             "ui": get_ui_labels(lang),
             "client_i18n": get_client_i18n(),
@@ -394,27 +581,26 @@ async def report_page(
 
 @app.get("/api/report/{job_id}.json")
 async def report_json(job_id: str, lang: str = "en", db: Session = Depends(get_db)) -> JSONResponse:
-    payload = _report_payload(db, job_id)
-    return JSONResponse(content=localize_report(payload, normalize_lang(lang)))
+    return ORJSONResponse(content=_report_payload(db, job_id, normalize_lang(lang)))
 
 
 @app.get("/api/report/{job_id}.md")
-async def report_markdown(job_id: str, lang: str = "en", db: Session = Depends(get_db)) -> PlainTextResponse:
+async def report_markdown(job_id: str, lang: str = "en", db: Session = Depends(get_db)) -> StreamingResponse:
     normalized_lang = normalize_lang(lang)
-    payload = localize_report(_report_payload(db, job_id), normalized_lang)
-    return PlainTextResponse(
-        _report_to_markdown(payload, normalized_lang),
+    payload = _report_payload(db, job_id, normalized_lang)
+    return StreamingResponse(
+        _iter_report_markdown(payload, normalized_lang),
         media_type="text/markdown; charset=utf-8",
         headers={"Content-Disposition": f'attachment; filename="report-{job_id}.md"'},
     )
 
 
 @app.get("/api/report/{job_id}.txt")
-async def report_text(job_id: str, lang: str = "en", db: Session = Depends(get_db)) -> PlainTextResponse:
+async def report_text(job_id: str, lang: str = "en", db: Session = Depends(get_db)) -> StreamingResponse:
     normalized_lang = normalize_lang(lang)
-    payload = localize_report(_report_payload(db, job_id), normalized_lang)
-    return PlainTextResponse(
-        _report_to_markdown(payload, normalized_lang),
+    payload = _report_payload(db, job_id, normalized_lang)
+    return StreamingResponse(
+        _iter_report_markdown(payload, normalized_lang),
         media_type="text/plain; charset=utf-8",
         headers={"Content-Disposition": f'attachment; filename="report-{job_id}.txt"'},
     )
@@ -422,7 +608,7 @@ async def report_text(job_id: str, lang: str = "en", db: Session = Depends(get_d
 
 @app.get("/api/repos/{owner}/{repo}/history")
 async def repo_history(owner: str, repo: str, db: Session = Depends(get_db)) -> JSONResponse:
-    return JSONResponse({"owner": owner, "repo": repo, "history": _repo_history(db, owner, repo, limit=50)})
+    return ORJSONResponse({"owner": owner, "repo": repo, "history": _repo_history(db, owner, repo, limit=50)})
 
 
 @app.get("/api/repos/{owner}/{repo}/latest")
@@ -436,7 +622,7 @@ async def repo_latest(owner: str, repo: str, db: Session = Depends(get_db)) -> J
     )
     if not row:
         raise HTTPException(status_code=404, detail="No reports found")
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "job_id": row[0],
             "commit_sha": row[1],
@@ -449,17 +635,18 @@ async def repo_latest(owner: str, repo: str, db: Session = Depends(get_db)) -> J
 
 @app.get("/api/stats/repo/{owner}/{repo}.json")
 async def repo_stats_json(
+    request: Request,
     owner: str,
     repo: str,
     fields: str | None = None,
     langs_count: int = Query(default=10, ge=1, le=30),
-) -> JSONResponse:
+) -> Response:
     payload = await _build_public_repo_stats_payload(owner, repo, langs_count=langs_count)
     if fields:
         repository_raw = payload.get("repository")
         if isinstance(repository_raw, dict):
             payload["repository"] = _select_dict_fields(repository_raw, fields)
-    return JSONResponse(payload)
+    return _conditional_json_response(request, payload)
 
 
 @app.api_route("/api/stats/repo/{owner}/{repo}.svg", methods=["GET", "HEAD"])
@@ -476,22 +663,7 @@ async def repo_stats_svg(
     animate: bool = False,
     animation: str = "all",
     duration: int = Query(default=1400, ge=350, le=7000),
-    bg_start: str | None = Query(default=None),
-    bg_end: str | None = Query(default=None),
-    border: str | None = Query(default=None),
-    panel: str | None = Query(default=None),
-    overlay: str | None = Query(default=None),
-    chip_bg: str | None = Query(default=None),
-    chip_text: str | None = Query(default=None),
-    text: str | None = Query(default=None),
-    muted: str | None = Query(default=None),
-    accent: str | None = Query(default=None),
-    accent_2: str | None = Query(default=None),
-    accent_soft: str | None = Query(default=None),
-    track: str | None = Query(default=None),
-    pass_color: str | None = Query(default=None, alias="pass"),
-    warn: str | None = Query(default=None),
-    fail: str | None = Query(default=None),
+    custom_theme: dict[str, str] | None = Depends(custom_theme_params),
     cache_seconds: int = Query(default=21600, ge=0, le=86400),
 ) -> Response:
     if request.method == "HEAD":
@@ -499,27 +671,8 @@ async def repo_stats_svg(
 
     payload = await _build_public_repo_stats_payload(owner, repo, langs_count=max(4, langs_count))
     hidden = _parse_csv_flags(hide)
-    custom_theme = _collect_custom_theme(
-        {
-            "bg_start": bg_start,
-            "bg_end": bg_end,
-            "border": border,
-            "panel": panel,
-            "overlay": overlay,
-            "chip_bg": chip_bg,
-            "chip_text": chip_text,
-            "text": text,
-            "muted": muted,
-            "accent": accent,
-            "accent_2": accent_2,
-            "accent_soft": accent_soft,
-            "track": track,
-            "pass": pass_color,
-            "warn": warn,
-            "fail": fail,
-        }
-    )
-    svg = build_repo_stats_svg(
+    svg = _render_svg_cached(
+        build_repo_stats_svg,
         payload,
         theme=theme,
         custom_theme=custom_theme,
@@ -532,8 +685,7 @@ async def repo_stats_svg(
         animation=animation,
         duration_ms=duration,
     )
-    headers = _svg_cache_headers(cache_seconds)
-    return Response(content=svg, media_type="image/svg+xml", headers=headers)
+    return _conditional_response(request, svg, "image/svg+xml", _svg_cache_headers(cache_seconds))
 
 
 @app.api_route("/api", methods=["GET", "HEAD"])
@@ -552,22 +704,7 @@ async def readme_stats_api(
     animate: bool = False,
     animation: str = "all",
     duration: int = Query(default=1400, ge=350, le=7000),
-    bg_start: str | None = Query(default=None),
-    bg_end: str | None = Query(default=None),
-    border: str | None = Query(default=None),
-    panel: str | None = Query(default=None),
-    overlay: str | None = Query(default=None),
-    chip_bg: str | None = Query(default=None),
-    chip_text: str | None = Query(default=None),
-    text: str | None = Query(default=None),
-    muted: str | None = Query(default=None),
-    accent: str | None = Query(default=None),
-    accent_2: str | None = Query(default=None),
-    accent_soft: str | None = Query(default=None),
-    track: str | None = Query(default=None),
-    pass_color: str | None = Query(default=None, alias="pass"),
-    warn: str | None = Query(default=None),
-    fail: str | None = Query(default=None),
+    custom_theme: dict[str, str] | None = Depends(custom_theme_params),
     cache_seconds: int = Query(default=21600, ge=0, le=86400),
     fields: str | None = None,
     include_report: bool = False,
@@ -590,26 +727,6 @@ async def readme_stats_api(
 
     normalized_locale = normalize_lang(locale)
     hidden = _parse_csv_flags(hide)
-    custom_theme = _collect_custom_theme(
-        {
-            "bg_start": bg_start,
-            "bg_end": bg_end,
-            "border": border,
-            "panel": panel,
-            "overlay": overlay,
-            "chip_bg": chip_bg,
-            "chip_text": chip_text,
-            "text": text,
-            "muted": muted,
-            "accent": accent,
-            "accent_2": accent_2,
-            "accent_soft": accent_soft,
-            "track": track,
-            "pass": pass_color,
-            "warn": warn,
-            "fail": fail,
-        }
-    )
 
     if format == "json":
         if kind == "quality":
@@ -625,11 +742,12 @@ async def readme_stats_api(
                 repository_raw = payload.get("repository")
                 if isinstance(repository_raw, dict):
                     payload["repository"] = _select_dict_fields(repository_raw, fields)
-        return JSONResponse(payload)
+        return _conditional_json_response(request, payload)
 
     if kind == "quality":
         payload = await _build_quality_stats_payload(owner, repo, db, include_report=False)
-        svg = build_quality_stats_svg(
+        svg = _render_svg_cached(
+            build_quality_stats_svg,
             payload,
             theme=theme,
             custom_theme=custom_theme,
@@ -643,7 +761,8 @@ async def readme_stats_api(
         )
     else:
         payload = await _build_public_repo_stats_payload(owner, repo, langs_count=max(4, langs_count))
-        svg = build_repo_stats_svg(
+        svg = _render_svg_cached(
+            build_repo_stats_svg,
             payload,
             theme=theme,
             custom_theme=custom_theme,
@@ -656,26 +775,26 @@ async def readme_stats_api(
             animation=animation,
             duration_ms=duration,
         )
-    headers = _svg_cache_headers(cache_seconds)
-    return Response(content=svg, media_type="image/svg+xml", headers=headers)
+    return _conditional_response(request, svg, "image/svg+xml", _svg_cache_headers(cache_seconds))
 
 
 @app.get("/api/stats/quality/{owner}/{repo}.json")
 async def quality_stats_json(
+    request: Request,
     owner: str,
     repo: str,
     db: Session = Depends(get_db),
     fields: str | None = None,
     include_report: bool = False,
     locale: str = "en",
-) -> JSONResponse:
+) -> Response:
     payload = await _build_quality_stats_payload(owner, repo, db, include_report=include_report)
     payload = _localize_quality_payload(payload, normalize_lang(locale))
     if fields:
         quality_raw = payload.get("quality")
         if isinstance(quality_raw, dict):
             payload["quality"] = _select_dict_fields(quality_raw, fields)
-    return JSONResponse(payload)
+    return _conditional_json_response(request, payload)
 
 
 @app.api_route("/api/stats/quality/{owner}/{repo}.svg", methods=["GET", "HEAD"])
@@ -692,22 +811,7 @@ async def quality_stats_svg(
     animate: bool = False,
     animation: str = "all",
     duration: int = Query(default=1400, ge=350, le=7000),
-    bg_start: str | None = Query(default=None),
-    bg_end: str | None = Query(default=None),
-    border: str | None = Query(default=None),
-    panel: str | None = Query(default=None),
-    overlay: str | None = Query(default=None),
-    chip_bg: str | None = Query(default=None),
-    chip_text: str | None = Query(default=None),
-    text: str | None = Query(default=None),
-    muted: str | None = Query(default=None),
-    accent: str | None = Query(default=None),
-    accent_2: str | None = Query(default=None),
-    accent_soft: str | None = Query(default=None),
-    track: str | None = Query(default=None),
-    pass_color: str | None = Query(default=None, alias="pass"),
-    warn: str | None = Query(default=None),
-    fail: str | None = Query(default=None),
+    custom_theme: dict[str, str] | None = Depends(custom_theme_params),
     cache_seconds: int = Query(default=300, ge=0, le=86400),
 ) -> Response:
     if request.method == "HEAD":
@@ -715,27 +819,8 @@ async def quality_stats_svg(
 
     payload = await _build_quality_stats_payload(owner, repo, db, include_report=False)
     hidden = _parse_csv_flags(hide)
-    custom_theme = _collect_custom_theme(
-        {
-            "bg_start": bg_start,
-            "bg_end": bg_end,
-            "border": border,
-            "panel": panel,
-            "overlay": overlay,
-            "chip_bg": chip_bg,
-            "chip_text": chip_text,
-            "text": text,
-            "muted": muted,
-            "accent": accent,
-            "accent_2": accent_2,
-            "accent_soft": accent_soft,
-            "track": track,
-            "pass": pass_color,
-            "warn": warn,
-            "fail": fail,
-        }
-    )
-    svg = build_quality_stats_svg(
+    svg = _render_svg_cached(
+        build_quality_stats_svg,
         payload,
         theme=theme,
         custom_theme=custom_theme,
@@ -747,14 +832,15 @@ async def quality_stats_svg(
         animation=animation,
         duration_ms=duration,
     )
-    headers = _svg_cache_headers(cache_seconds)
-    return Response(content=svg, media_type="image/svg+xml", headers=headers)
+    return _conditional_response(request, svg, "image/svg+xml", _svg_cache_headers(cache_seconds))
 
 
 @app.get("/api/stats/{owner}/{repo}.json")
-async def legacy_stats_json(owner: str, repo: str, db: Session = Depends(get_db)) -> JSONResponse:
+async def legacy_stats_json(
+    request: Request, owner: str, repo: str, db: Session = Depends(get_db)
+) -> Response:
     payload = await _build_combined_stats_payload(owner, repo, db)
-    return JSONResponse(payload)
+    return _conditional_json_response(request, payload)
 
 
 @app.api_route("/api/stats/{owner}/{repo}.svg", methods=["GET", "HEAD"])
@@ -772,22 +858,7 @@ async def legacy_stats_svg(
     animate: bool = False,
     animation: str = "all",
     duration: int = Query(default=1400, ge=350, le=7000),
-    bg_start: str | None = Query(default=None),
-    bg_end: str | None = Query(default=None),
-    border: str | None = Query(default=None),
-    panel: str | None = Query(default=None),
-    overlay: str | None = Query(default=None),
-    chip_bg: str | None = Query(default=None),
-    chip_text: str | None = Query(default=None),
-    text: str | None = Query(default=None),
-    muted: str | None = Query(default=None),
-    accent: str | None = Query(default=None),
-    accent_2: str | None = Query(default=None),
-    accent_soft: str | None = Query(default=None),
-    track: str | None = Query(default=None),
-    pass_color: str | None = Query(default=None, alias="pass"),
-    warn: str | None = Query(default=None),
-    fail: str | None = Query(default=None),
+    custom_theme: dict[str, str] | None = Depends(custom_theme_params),
     cache_seconds: int = Query(default=21600, ge=0, le=86400),
 ) -> Response:
     if request.method == "HEAD":
@@ -795,27 +866,8 @@ async def legacy_stats_svg(
 
     payload = await _build_combined_stats_payload(owner, repo, db)
     hidden = _parse_csv_flags(hide)
-    custom_theme = _collect_custom_theme(
-        {
-            "bg_start": bg_start,
-            "bg_end": bg_end,
-            "border": border,
-            "panel": panel,
-            "overlay": overlay,
-            "chip_bg": chip_bg,
-            "chip_text": chip_text,
-            "text": text,
-            "muted": muted,
-            "accent": accent,
-            "accent_2": accent_2,
-            "accent_soft": accent_soft,
-            "track": track,
-            "pass": pass_color,
-            "warn": warn,
-            "fail": fail,
-        }
-    )
-    svg = build_repo_stats_svg(
+    svg = _render_svg_cached(
+        build_repo_stats_svg,
         payload,
         theme=theme,
         custom_theme=custom_theme,
@@ -828,8 +880,7 @@ async def legacy_stats_svg(
         animation=animation,
         duration_ms=duration,
     )
-    headers = _svg_cache_headers(cache_seconds)
-    return Response(content=svg, media_type="image/svg+xml", headers=headers)
+    return _conditional_response(request, svg, "image/svg+xml", _svg_cache_headers(cache_seconds))
 
 
 @app.get("/api/compare/{job_id}/{previous_job_id}")
@@ -846,12 +897,12 @@ async def compare_reports(job_id: str, previous_job_id: str, db: Session = Depen
         [],
         current_payload.get("commit_sha"),
     )
-    return JSONResponse(content=comparison.model_dump(mode="json"))
+    return ORJSONResponse(content=comparison.model_dump(mode="json"))
 
 
 @app.get("/health")
 async def health() -> JSONResponse:
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "status": "ok",
             "version": app.version,
@@ -862,28 +913,24 @@ async def health() -> JSONResponse:
 
 
 @app.get("/metrics")
-async def metrics() -> PlainTextResponse:
-    lines = [
-        "# TYPE rqi_http_requests_total counter",
-        f"rqi_http_requests_total {_metrics['http_requests_total']}",
-        "# TYPE rqi_http_request_errors_total counter",
-        f"rqi_http_request_errors_total {_metrics['http_request_errors_total']}",
-        "# TYPE rqi_scan_jobs_started_total counter",
-        f"rqi_scan_jobs_started_total {_metrics['scan_jobs_started_total']}",
-        "# TYPE rqi_scan_jobs_done_total counter",
-        f"rqi_scan_jobs_done_total {_metrics['scan_jobs_done_total']}",
-        "# TYPE rqi_scan_jobs_failed_total counter",
-        f"rqi_scan_jobs_failed_total {_metrics['scan_jobs_failed_total']}",
-        "# TYPE rqi_scan_jobs_cached_total counter",
-        f"rqi_scan_jobs_cached_total {_metrics['scan_jobs_cached_total']}",
-        "# TYPE rqi_github_api_errors_total counter",
-        f"rqi_github_api_errors_total {_metrics['github_api_errors_total']}",
-    ]
-    return PlainTextResponse("\n".join(lines) + "\n")
+async def metrics() -> Response:
+    with _metrics_lock:
+        values = _metric_values(_metrics)
+    if _pool_checked_out is not None:
+        values += (_pool_checked_out(),)
+    return Response(
+        content=_METRICS_TEMPLATE % values,
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+        headers={"Cache-Control": "no-store"},
+    )
 
 
 def run_scan_job(job_id: str, github_token: str | None = None) -> None:
-    """Bridge sync BackgroundTasks callback to async scanner."""
+    """Bridge sync BackgroundTasks callback to async scanner.
+
+    Starlette runs sync background tasks in its threadpool, so the scan gets its own
+    event loop there and its blocking `SessionLocal` calls never stall request handlers.
+    """
 
     asyncio.run(scan_job_async(job_id, github_token))
 
@@ -891,68 +938,60 @@ def run_scan_job(job_id: str, github_token: str | None = None) -> None:
 async def scan_job_async(job_id: str, github_token: str | None = None) -> None:
     """Execute one scan job lifecycle and persist final report."""
 
+    # One session for the whole job: between commits it holds no connection, so keeping it
+    # open across GitHub round-trips costs nothing, and the job row stays in its identity map.
     db = SessionLocal()
     try:
         job = db.get(ScanJob, job_id)
         if not job:
             return
-        owner, repo = job.repo_owner, job.repo_name
         job.status, job.started_at, job.progress, job.error_message = "running", datetime.now(UTC), 10, None
         db.commit()
+        await _run_scan(db, job, github_token)
     finally:
         db.close()
 
+
+async def _run_scan(db: Session, job: ScanJob, github_token: str | None) -> None:
+    job_id = job.id
+    client = GitHubClient(token=github_token)
     try:
-        client = GitHubClient(token=github_token)
-        snapshot = await client.get_repo_snapshot(owner, repo)
-        cached_payload = _find_cached_report_for_commit(
-            snapshot.owner,
-            snapshot.name,
-            snapshot.default_branch_sha,
-            job_id,
-        )
+        snapshot = await client.get_repo_snapshot(job.repo_owner, job.repo_name)
+        previous = _latest_previous_report(db, snapshot.owner, snapshot.name, job_id)
+        cached_payload = _cached_report_for_commit(previous, snapshot.default_branch_sha)
         if cached_payload is not None:
-            _metrics["scan_jobs_cached_total"] += 1
-            cached_payload["generated_at"] = datetime.now(UTC).isoformat()
+            _increment_metric("scan_jobs_cached_total")
+            finished_at = datetime.now(UTC)
+            cached_payload["generated_at"] = finished_at.isoformat()
             cached_payload["job_id"] = job_id
             cached_payload["commit_sha"] = snapshot.default_branch_sha
             _finalize_success_job(
-                job_id,
+                db,
+                job,
                 snapshot.owner,
                 snapshot.name,
                 snapshot.default_branch_sha,
                 cached_payload,
+                finished_at,
             )
             return
 
-        db_mid = SessionLocal()
-        try:
-            job_mid = db_mid.get(ScanJob, job_id)
-            if job_mid:
-                job_mid.progress = 65
-                db_mid.commit()
-        finally:
-            db_mid.close()
+        # Committed rather than flushed: progress polling reads it from other connections.
+        job.progress = 65
+        db.commit()
 
         policy = load_repo_policy(snapshot)
-        checks = run_all_checks(snapshot, enable_network=True, policy=policy)
-        stacks = detect_stacks(snapshot)
-        metrics = project_line_metrics(snapshot)
-        previous = _latest_previous_report(snapshot.owner, snapshot.name, job_id)
+        # The compare call only needs the previous commit, so it runs while the checks
+        # execute off the event loop.
+        changed_files_task = asyncio.create_task(_fetch_changed_files(client, snapshot, previous))
+        try:
+            checks, stacks, metrics = await _analyze_snapshot_offloaded(snapshot, True, policy)
+        except BaseException:
+            changed_files_task.cancel()
+            raise
         prev_score = _extract_previous_score(previous)
-        provisional = build_report(
-            repo_owner=snapshot.owner,
-            repo_name=snapshot.name,
-            repo_url=snapshot.url,
-            checks_by_category=checks,
-            project_metrics=metrics,
-            detected_stacks=stacks,
-            category_weights=policy.category_weights,
-            job_id=job_id,
-            commit_sha=snapshot.default_branch_sha,
-            policy_issues=policy.validation_errors,
-        )
-        guard = _score_regression_check(prev_score, provisional.score_total, policy)
+        provisional_score = compute_score_total(checks, policy.category_weights)
+        guard = _score_regression_check(prev_score, provisional_score, policy)
         if guard:
             checks.setdefault("governance", []).append(guard)
 
@@ -968,44 +1007,116 @@ async def scan_job_async(job_id: str, github_token: str | None = None) -> None:
             commit_sha=snapshot.default_branch_sha,
             policy_issues=policy.validation_errors,
         )
-        changed_files: list[str] = []
-        if previous and snapshot.default_branch_sha and previous.get("commit_sha"):
-            try:
-                changed_files = await client.get_changed_files_between_commits(
-                    snapshot.owner,
-                    snapshot.name,
-                    str(previous.get("commit_sha")),
-                    snapshot.default_branch_sha,
-                )
-            except GitHubAPIError:
-                changed_files = []
+        changed_files = await changed_files_task
 
+        # Dumped once: the comparison only reads scores and statuses, so it is patched
+        # into the dict rather than set on the model and serialized again.
         report_dict = report.model_dump(mode="json")
-        report.comparison = _build_report_comparison(
+        comparison = _build_report_comparison(
             previous,
             report_dict,
             changed_files,
             snapshot.default_branch_sha,
         )
+        report_dict["comparison"] = comparison.model_dump(mode="json")
         _finalize_success_job(
-            job_id,
+            db,
+            job,
             snapshot.owner,
             snapshot.name,
             snapshot.default_branch_sha,
-            report.model_dump(mode="json"),
+            report_dict,
+            datetime.now(UTC),
         )
     except GitHubAPIError as exc:
-        _metrics["github_api_errors_total"] += 1
-        _mark_failed(job_id, str(exc))
+        _increment_metric("github_api_errors_total")
+        _mark_failed(db, job_id, str(exc))
     except Exception as exc:  # pragma: no cover
-        _mark_failed(job_id, f"Unexpected error while scanning repository: {exc}")
+        _mark_failed(db, job_id, f"Unexpected error while scanning repository: {exc}")
+    finally:
+        await client.aclose()
+
+
+def _analyze_snapshot(
+    snapshot: RepoSnapshot,
+    enable_network: bool,
+    policy: RepoPolicy,
+) -> tuple[dict[str, list[CheckResult]], list[str], ProjectMetrics]:
+    """Run the CPU-bound part of a scan; module-level so pool processes can unpickle it."""
+
+    index = TreeIndex.from_paths(snapshot.tree_paths)
+    checks = run_all_checks(snapshot, enable_network=enable_network, policy=policy, index=index)
+    return checks, detect_stacks(snapshot, index=index), project_line_metrics(snapshot)
+
+
+def _get_cpu_pool() -> ProcessPoolExecutor | None:
+    global _cpu_pool
+
+    if settings.scan_cpu_workers <= 0:
+        return None
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            # spawn, not fork: the server process already runs threads (anyio, scan workers).
+            _cpu_pool = ProcessPoolExecutor(
+                max_workers=settings.scan_cpu_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _cpu_pool
+
+
+async def _analyze_snapshot_offloaded(
+    snapshot: RepoSnapshot,
+    enable_network: bool,
+    policy: RepoPolicy,
+) -> tuple[dict[str, list[CheckResult]], list[str], ProjectMetrics]:
+    """Run `_analyze_snapshot` without blocking the event loop.
+
+    With `scan.cpu_workers` set the work goes to a process pool, so a scan does not hold
+    the GIL against request handling; otherwise it runs in a thread, which only keeps the
+    loop responsive while the checks wait on the network.
+    """
+
+    pool = _get_cpu_pool()
+    if pool is None:
+        return await asyncio.to_thread(_analyze_snapshot, snapshot, enable_network, policy)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, _analyze_snapshot, snapshot, enable_network, policy)
+
+
+async def _fetch_changed_files(
+    client: GitHubClient,
+    snapshot: RepoSnapshot,
+    previous: dict[str, object] | None,
+) -> list[str]:
+    if not previous or not snapshot.default_branch_sha or not previous.get("commit_sha"):
+        return []
+    try:
+        return await client.get_changed_files_between_commits(
+            snapshot.owner,
+            snapshot.name,
+            str(previous.get("commit_sha")),
+            snapshot.default_branch_sha,
+        )
+    except GitHubAPIError:
+        return []
 
 
 async def _build_combined_stats_payload(owner: str, repo: str, db: Session) -> dict[str, object]:
-    repo_payload = await _build_public_repo_stats_payload(owner, repo, langs_count=10)
     quality = _latest_repo_quality_snapshot(db, owner, repo, include_report=False)
     if quality is None:
-        quality = await _build_live_quality_snapshot(owner, repo, include_report=False)
+        # Both need GitHub round-trips, so run them side by side. A repo stats error still wins.
+        repo_result, quality_result = await asyncio.gather(
+            _build_public_repo_stats_payload(owner, repo, langs_count=10),
+            _build_live_quality_snapshot(owner, repo, include_report=False),
+            return_exceptions=True,
+        )
+        if isinstance(repo_result, BaseException):
+            raise repo_result
+        if isinstance(quality_result, BaseException):
+            raise quality_result
+        repo_payload, quality = repo_result, quality_result
+    else:
+        repo_payload = await _build_public_repo_stats_payload(owner, repo, langs_count=10)
     payload: dict[str, object] = {
         "generated_at": datetime.now(UTC).isoformat(),
         "repository": repo_payload["repository"],
@@ -1023,16 +1134,21 @@ async def _build_combined_stats_payload(owner: str, repo: str, db: Session) -> d
 
 
 async def _build_public_repo_stats_payload(owner: str, repo: str, langs_count: int = 10) -> dict[str, object]:
-    client = GitHubClient()
     cache_key = f"{owner.strip().lower()}/{repo.strip().lower()}"
     cached = _repo_stats_cache.get(cache_key)
+    if cached:
+        _repo_stats_cache.move_to_end(cache_key)
     repo_stats: RepoPublicStats | None = None
     if cached and (time.time() - cached[0]) <= _REPO_STATS_CACHE_TTL_SECONDS:
         repo_stats = cached[1]
     try:
         if repo_stats is None:
-            repo_stats = await client.get_repo_public_stats(owner, repo)
+            async with GitHubClient() as client:
+                repo_stats = await client.get_repo_public_stats(owner, repo)
             _repo_stats_cache[cache_key] = (time.time(), repo_stats)
+            _repo_stats_cache.move_to_end(cache_key)
+            if len(_repo_stats_cache) > _REPO_STATS_CACHE_MAX_ENTRIES:
+                _repo_stats_cache.popitem(last=False)
     except GitHubAPIError as exc:
         if cached:
             repo_stats = cached[1]
@@ -1093,27 +1209,26 @@ async def _build_live_quality_snapshot(
         f"/report={1 if include_report else 0}"
     )
     cached_entry = _quality_live_cache.get(cache_key)
-    cached_payload = cached_entry[1] if cached_entry else None
+    if cached_entry:
+        _quality_live_cache.move_to_end(cache_key)
     if cached_entry and (time.time() - cached_entry[0]) <= _QUALITY_LIVE_CACHE_TTL_SECONDS:
-        return json.loads(json.dumps(cached_entry[1]))
+        return orjson.loads(cached_entry[1])
 
-    client = GitHubClient()
     try:
         line_count_fetch_limit = None if include_report else _LIVE_SNAPSHOT_LINE_COUNT_FETCH_LIMIT
-        snapshot = await client.get_repo_snapshot(
-            owner,
-            repo,
-            line_count_fetch_limit=line_count_fetch_limit,
-        )
+        async with GitHubClient() as client:
+            snapshot = await client.get_repo_snapshot(
+                owner,
+                repo,
+                line_count_fetch_limit=line_count_fetch_limit,
+            )
     except GitHubAPIError as exc:
-        if isinstance(cached_payload, dict):
-            return json.loads(json.dumps(cached_payload))
+        if cached_entry:
+            return orjson.loads(cached_entry[1])
         raise _github_error_to_http(exc) from exc
 
     policy = load_repo_policy(snapshot)
-    checks = run_all_checks(snapshot, enable_network=False, policy=policy)
-    stacks = detect_stacks(snapshot)
-    metrics = project_line_metrics(snapshot)
+    checks, stacks, metrics = await _analyze_snapshot_offloaded(snapshot, False, policy)
     report = build_report(
         repo_owner=snapshot.owner,
         repo_name=snapshot.name,
@@ -1126,39 +1241,22 @@ async def _build_live_quality_snapshot(
         policy_issues=policy.validation_errors,
     )
     report_payload = report.model_dump(mode="json")
-    status_counts = {"pass": 0, "warn": 0, "fail": 0}
-    category_scores: list[dict[str, object]] = []
-    for category in report.categories:
-        category_scores.append(
-            {
-                "id": category.id,
-                "name": category.name,
-                "score": int(category.score),
-                "weight": int(category.weight),
-            }
-        )
-        for check in category.checks:
-            if check.status in status_counts:
-                status_counts[check.status] += 1
-
     result: dict[str, object] = {
         "job_id": None,
         "commit_sha": snapshot.default_branch_sha,
         "finished_at": datetime.now(UTC).isoformat(),
         "score_total": int(report.score_total),
         "report_url": None,
-        "total_code_lines": int(report.project_metrics.total_code_lines),
-        "total_code_files": int(report.project_metrics.total_code_files),
-        "scanned_code_files": int(report.project_metrics.scanned_code_files),
-        "status_counts": status_counts,
-        "category_scores": category_scores,
-        "detected_stacks": [str(stack) for stack in stacks[:20]],
+        **_build_quality_summary(report_payload),
         "source": "live",
     }
     if include_report:
         result["report"] = report_payload
-    _quality_live_cache[cache_key] = (time.time(), result)
-    return json.loads(json.dumps(result))
+    _quality_live_cache[cache_key] = (time.time(), orjson.dumps(result))
+    _quality_live_cache.move_to_end(cache_key)
+    if len(_quality_live_cache) > _QUALITY_LIVE_CACHE_MAX_ENTRIES:
+        _quality_live_cache.popitem(last=False)
+    return result
 
 
 def _serialize_repo_stats(repo_stats: RepoPublicStats) -> dict[str, object]:
@@ -1201,30 +1299,70 @@ def _latest_repo_quality_snapshot(
     repo: str,
     include_report: bool = False,
 ) -> dict[str, object] | None:
-    row = (
-        db.query(
-            ScanJob.id,
-            ScanJob.commit_sha,
-            ScanJob.finished_at,
-            ScanReport.score_total,
-            ScanReport.report_json,
-        )
+    stmt = (
+        select(ScanJob.id, ScanJob.commit_sha, ScanJob.finished_at, ScanReport.score_total)
         .join(ScanReport, ScanReport.job_id == ScanJob.id)
-        .filter(ScanJob.repo_owner == owner, ScanJob.repo_name == repo, ScanJob.status == "done")
+        .where(ScanJob.repo_owner == owner, ScanJob.repo_name == repo, ScanJob.status == "done")
         .order_by(ScanJob.finished_at.desc())
-        .first()
+        .limit(1)
     )
+    row = db.execute(stmt).first()
     if not row:
         return None
 
-    payload: dict[str, object] = {}
-    try:
-        parsed = json.loads(row[4])
-        if isinstance(parsed, dict):
-            payload = parsed
-    except (TypeError, ValueError, json.JSONDecodeError):
+    job_id, commit_sha, finished_at, score_total = row
+    payload, summary = _get_quality_summary(db, job_id)
+    result: dict[str, object] = {
+        "job_id": job_id,
+        "commit_sha": commit_sha,
+        "finished_at": finished_at.isoformat() if finished_at else None,
+        "score_total": int(score_total),
+        "report_url": f"/report/{job_id}",
+        **summary,
+    }
+    # The summary is shared; callers localize category names in place, so copy the mutable parts.
+    result["status_counts"] = dict(summary["status_counts"])  # type: ignore[call-overload]
+    result["category_scores"] = [dict(item) for item in summary["category_scores"]]  # type: ignore[attr-defined]
+    result["detected_stacks"] = list(summary["detected_stacks"])  # type: ignore[call-overload]
+    if include_report:
+        result["report"] = payload
+    return result
+
+
+def _get_quality_summary(db: Session, job_id: str) -> tuple[dict[str, object], dict[str, object]]:
+    """Return a done job's parsed report and its quality summary, both cached per job.
+
+    Only the small `job_id` lookup hits the database once a job is cached; the report blob
+    is loaded, parsed and walked once. Callers must not mutate either mapping.
+    """
+
+    with _report_cache_lock:
+        variants = _report_cache.get(job_id)
+        if variants is not None:
+            _report_cache.move_to_end(job_id)
+            summary = variants.get(_QUALITY_SUMMARY_VARIANT)
+            if summary is not None:
+                return variants[""], summary
+            payload: Any = variants[""]
+        else:
+            payload = None
+    if payload is None:
+        raw = db.query(ScanReport.report_json).filter(ScanReport.job_id == job_id).scalar()
+        try:
+            payload = _get_parsed_report(job_id, raw)
+        except (TypeError, ValueError, orjson.JSONDecodeError):
+            payload = None
+    if not isinstance(payload, dict):
         payload = {}
+    summary = _build_quality_summary(payload)
+    with _report_cache_lock:
+        variants = _report_cache.get(job_id)
+        if variants is not None:
+            variants[_QUALITY_SUMMARY_VARIANT] = summary
+    return payload, summary
+
 
+def _build_quality_summary(payload: dict[str, object]) -> dict[str, object]:
     project_metrics_raw = payload.get("project_metrics")
     project_metrics = project_metrics_raw if isinstance(project_metrics_raw, dict) else {}
     status_counts = {"pass": 0, "warn": 0, "fail": 0}
@@ -1258,12 +1396,7 @@ def _latest_repo_quality_snapshot(
     if not isinstance(detected_stacks, list):
         detected_stacks = []
 
-    result: dict[str, object] = {
-        "job_id": row[0],
-        "commit_sha": row[1],
-        "finished_at": row[2].isoformat() if row[2] else None,
-        "score_total": int(row[3]),
-        "report_url": f"/report/{row[0]}",
+    return {
         "total_code_lines": int(project_metrics.get("total_code_lines", 0) or 0),
         "total_code_files": int(project_metrics.get("total_code_files", 0) or 0),
         "scanned_code_files": int(project_metrics.get("scanned_code_files", 0) or 0),
@@ -1271,9 +1404,6 @@ def _latest_repo_quality_snapshot(
         "category_scores": category_scores,
         "detected_stacks": [str(stack) for stack in detected_stacks[:20]],
     }
-    if include_report:
-        result["report"] = payload
-    return result
 
 
 def _parse_csv_flags(value: str | None) -> set[str]:
@@ -1291,7 +1421,7 @@ def _github_error_to_http(exc: GitHubAPIError) -> HTTPException:
 
     message = str(exc)
     lowered = message.lower()
-    if "rate limit exceeded" in lowered:
+    if isinstance(exc, GitHubRateLimitError) or "rate limit exceeded" in lowered:
         return HTTPException(
             status_code=429,
             detail=(
@@ -1309,16 +1439,8 @@ def _github_error_to_http(exc: GitHubAPIError) -> HTTPException:
     return HTTPException(status_code=502, detail=message)
 
 
-def _collect_custom_theme(raw_values: dict[str, str | None]) -> dict[str, str] | None:
-    sanitized: dict[str, str] = {}
-    for key in THEME_KEYS:
-        value = raw_values.get(key)
-        normalized = _normalize_hex_color(value)
-        if normalized is not None:
-            sanitized[key] = normalized
-    return sanitized or None
-
-
+# Badge URLs repeat the same few colors on every render, so normalized results are memoized.
+@lru_cache(maxsize=1024)
 def _normalize_hex_color(value: str | None) -> str | None:
     if not value:
         return None
@@ -1330,6 +1452,31 @@ def _normalize_hex_color(value: str | None) -> str | None:
     return candidate.upper()
 
 
+def _make_theme_collector(
+    keys: tuple[str, ...],
+) -> Callable[[dict[str, str | None]], dict[str, str] | None]:
+    """Build a custom-theme collector specialized for a fixed tuple of theme keys."""
+
+    normalize = _normalize_hex_color
+
+    def collect(raw_values: dict[str, str | None]) -> dict[str, str] | None:
+        sanitized: dict[str, str] = {}
+        for key in keys:
+            value = raw_values.get(key)
+            # Most requests pass no overrides, so skip the normalizer call for empty slots.
+            if not value:
+                continue
+            normalized = normalize(value)
+            if normalized is not None:
+                sanitized[key] = normalized
+        return sanitized or None
+
+    return collect
+
+
+_collect_custom_theme = _make_theme_collector(THEME_KEYS)
+
+
 def _select_dict_fields(data: dict[str, object], fields: str) -> dict[str, object]:
     allowed = _parse_csv_flags(fields)
     if not allowed:
@@ -1368,53 +1515,172 @@ def _localize_quality_payload(payload: dict[str, object], lang: str) -> dict[str
     return payload
 
 
-def _svg_cache_headers(cache_seconds: int) -> dict[str, str]:
+def _render_svg_cached(builder: Callable[..., str], payload: dict[str, object], **options: Any) -> str:
+    """Render a stats card, reusing the SVG when the card data and options are unchanged.
+
+    Cards only read the `repository` and `quality` sections, so the key is built from those
+    (not from per-request fields such as `generated_at`); fresh data always yields a new key.
+    """
+
+    try:
+        key = (
+            builder.__name__,
+            orjson.dumps([payload.get("repository"), payload.get("quality")], option=orjson.OPT_SORT_KEYS),
+            orjson.dumps({**options, "hide": sorted(options.get("hide") or ())}, option=orjson.OPT_SORT_KEYS),
+        )
+    except TypeError:
+        return builder(payload, **options)
+    svg = _svg_render_cache.get(key)
+    if svg is not None:
+        _svg_render_cache.move_to_end(key)
+        return svg
+    svg = builder(payload, **options)
+    _svg_render_cache[key] = svg
+    if len(_svg_render_cache) > _SVG_RENDER_CACHE_MAX_ENTRIES:
+        _svg_render_cache.popitem(last=False)
+    return svg
+
+
+@lru_cache(maxsize=512)
+def _svg_cache_headers(cache_seconds: int) -> Mapping[str, str]:
+    # Read-only view: the same mapping is shared by every response with this max-age.
     if cache_seconds <= 0:
-        return {"Cache-Control": "no-store"}
-    return {"Cache-Control": f"public, max-age={cache_seconds}"}
+        return MappingProxyType({"Cache-Control": "no-store"})
+    return MappingProxyType({"Cache-Control": f"public, max-age={cache_seconds}"})
 
 
-def _report_payload(db: Session, job_id: str) -> dict[str, object]:
-    """Load and validate stored report payload for a completed job."""
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §8.8.3.2): only the opaque tag has to match.
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
 
-    job = db.get(ScanJob, job_id)
+
+def _conditional_response(
+    request: Request,
+    content: str | bytes,
+    media_type: str,
+    headers: Mapping[str, str] | None = None,
+    etag: str | None = None,
+) -> Response:
+    """Return `content` with an ETag, or an empty 304 when the client already holds it."""
+
+    body = content.encode("utf-8") if isinstance(content, str) else content
+    if etag is None:
+        etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    response_headers = {**headers, "ETag": etag} if headers else {"ETag": etag}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=response_headers)
+    return Response(content=body, media_type=media_type, headers=response_headers)
+
+
+def _conditional_json_response(request: Request, payload: dict[str, Any]) -> Response:
+    # `generated_at` changes on every request, so it is left out of the (weak) validator.
+    stable = {key: value for key, value in payload.items() if key != "generated_at"}
+    digest = hashlib.blake2b(orjson.dumps(stable, option=orjson.OPT_SORT_KEYS), digest_size=12).hexdigest()
+    return _conditional_response(request, orjson.dumps(payload), "application/json", etag=f'W/"{digest}"')
+
+
+def _report_payload(db: Session, job_id: str, lang: str | None = None) -> dict[str, object]:
+    """Load and validate stored report payload for a completed job, localized when `lang` is given."""
+
+    job = _job_row_with_report(db, job_id, ScanJob.status)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    if job.status != "done" or not job.report:
+    if job.status != "done" or job.report_json is None:
         raise HTTPException(status_code=409, detail="Report is not ready")
-    payload = json.loads(job.report.report_json)
+    if lang is None:
+        payload = _get_parsed_report(job.id, job.report_json)
+    else:
+        payload = _get_localized_report(job.id, job.report_json, lang)
     if not isinstance(payload, dict):
         raise HTTPException(status_code=500, detail="Stored report is corrupted")
     return payload
 
 
-def _mark_failed(job_id: str, error_message: str) -> None:
+def _job_row_with_report(db: Session, job_id: str, *columns: Any) -> Any:
+    """Fetch `id`, the requested job columns and the stored report JSON in one query."""
+
+    return (
+        db.query(ScanJob.id, *columns, ScanReport.report_json)
+        .outerjoin(ScanReport, ScanReport.job_id == ScanJob.id)
+        .filter(ScanJob.id == job_id)
+        .first()
+    )
+
+
+def _get_parsed_report(job_id: str, raw: str) -> Any:
+    """Parse stored report JSON once per job; callers must not mutate the result."""
+
+    with _report_cache_lock:
+        variants = _report_cache.get(job_id)
+        if variants is not None:
+            _report_cache.move_to_end(job_id)
+            return variants[""]
+    payload = orjson.loads(raw)
+    if isinstance(payload, dict):
+        with _report_cache_lock:
+            _report_cache[job_id] = {"": payload}
+            while len(_report_cache) > _REPORT_CACHE_MAX_ENTRIES:
+                _report_cache.popitem(last=False)
+    return payload
+
+
+def _get_localized_report(job_id: str, raw: str, lang: str) -> Any:
+    """Return the stored report localized to `lang`, reusing earlier localizations of the same job."""
+
+    lang = normalize_lang(lang)
+    with _report_cache_lock:
+        variants = _report_cache.get(job_id)
+        cached = variants.get(lang) if variants is not None else None
+    if cached is not None:
+        return cached
+    payload = _get_parsed_report(job_id, raw)
+    if not isinstance(payload, dict):
+        return payload
+    localized = localize_report(payload, lang)
+    with _report_cache_lock:
+        variants = _report_cache.get(job_id)
+        if variants is not None:
+            variants[lang] = localized
+    return localized
+
+
+def _evict_parsed_reports(job_ids: set[str]) -> None:
+    with _report_cache_lock:
+        for job_id in job_ids:
+            _report_cache.pop(job_id, None)
+
+
+def _mark_failed(db: Session, job_id: str, error_message: str) -> None:
     """Mark scan job as failed and store error message."""
 
-    db = SessionLocal()
-    try:
-        job = db.get(ScanJob, job_id)
-        if not job:
-            return
-        job.status = "failed"
-        job.progress = 100
-        job.finished_at = datetime.now(UTC)
-        job.error_message = error_message
-        _metrics["scan_jobs_failed_total"] += 1
-        db.commit()
-    finally:
-        db.close()
+    # The failure may have interrupted a write; start from a clean transaction.
+    db.rollback()
+    job = db.get(ScanJob, job_id)
+    if not job:
+        return
+    job.status = "failed"
+    job.progress = 100
+    job.finished_at = datetime.now(UTC)
+    job.error_message = error_message
+    _increment_metric("scan_jobs_failed_total")
+    db.commit()
 
 
 def _repo_history(db: Session, owner: str, repo: str, limit: int = 30) -> list[dict[str, object]]:
-    rows = (
-        db.query(ScanJob.id, ScanJob.created_at, ScanJob.commit_sha, ScanReport.score_total)
+    stmt = (
+        select(ScanJob.id, ScanJob.created_at, ScanJob.commit_sha, ScanReport.score_total)
         .join(ScanReport, ScanReport.job_id == ScanJob.id)
-        .filter(ScanJob.repo_owner == owner, ScanJob.repo_name == repo, ScanJob.status == "done")
+        .where(ScanJob.repo_owner == owner, ScanJob.repo_name == repo, ScanJob.status == "done")
         .order_by(ScanJob.created_at.desc())
         .limit(limit)
-        .all()
     )
+    rows = db.execute(stmt).all()
     history: list[dict[str, object]] = []
     prev_score: int | None = None
     for job_id, created_at, commit_sha, score in reversed(rows):
@@ -1433,120 +1699,210 @@ def _repo_history(db: Session, owner: str, repo: str, limit: int = 30) -> list[d
     return history
 
 
+class _SlidingWindowCounter:
+    """Per-second request counts over the last `_RATE_WINDOW_SECONDS` seconds, kept in a ring."""
+
+    __slots__ = ("buckets", "last_second")
+
+    def __init__(self, second: int) -> None:
+        self.buckets = array("I", _ZERO_BUCKETS)
+        self.last_second = second
+
+    def advance(self, second: int) -> None:
+        """Zero the buckets of the seconds elapsed since the previous call."""
+
+        elapsed = second - self.last_second
+        if elapsed <= 0:
+            return
+        size = _RATE_WINDOW_SECONDS
+        if elapsed >= size:
+            self.buckets[:] = _ZERO_BUCKETS
+        else:
+            start = (self.last_second + 1) % size
+            end = start + elapsed
+            if end <= size:
+                self.buckets[start:end] = _ZERO_BUCKETS[: end - start]
+            else:
+                self.buckets[start:] = _ZERO_BUCKETS[: size - start]
+                self.buckets[: end - size] = _ZERO_BUCKETS[: end - size]
+        self.last_second = second
+
+    def total(self) -> int:
+        return sum(self.buckets)
+
+    def is_idle(self, second: int) -> bool:
+        return second - self.last_second >= _RATE_WINDOW_SECONDS
+
+
 def _enforce_scan_access_limits(request: Request) -> None:
-    """Apply per-client rate limit and daily quota."""
+    """Apply per-client rate limit and daily quota.
+
+    Runs on the event loop without awaiting, so the check-and-increment needs no lock.
+    """
+
+    global _scan_windows_swept_at, _scan_daily_bucket
 
     identity = request.client.host if request.client else "unknown"
-    now = time.time()
-    queue = _scan_requests[identity]
-    while queue and now - queue[0] > _RATE_WINDOW_SECONDS:
-        queue.popleft()
-    if len(queue) >= settings.scan_rate_limit_per_minute:
+    if _shared_scan_counters is not None:
+        now = datetime.now(UTC)
+        blocked = _shared_scan_counters.acquire(
+            identity,
+            int(now.timestamp()),
+            settings.scan_rate_limit_per_minute,
+            now.toordinal(),
+            settings.scan_daily_quota,
+        )
+        if blocked == "minute":
+            raise HTTPException(status_code=429, detail="Rate limit exceeded.")
+        if blocked == "day":
+            raise HTTPException(status_code=429, detail=f"Daily quota exceeded: {settings.scan_daily_quota}")
+        return
+    second = int(time.monotonic())
+    if second - _scan_windows_swept_at >= _RATE_WINDOW_SECONDS:
+        _scan_windows_swept_at = second
+        # LRU order is last-activity order, so idle identities form a prefix.
+        while _scan_windows and next(iter(_scan_windows.values())).is_idle(second):
+            _scan_windows.popitem(last=False)
+    window = _scan_windows.get(identity)
+    if window is None:
+        window = _scan_windows[identity] = _SlidingWindowCounter(second)
+        if len(_scan_windows) > _SCAN_WINDOWS_MAX_ENTRIES:
+            _scan_windows.popitem(last=False)
+    else:
+        _scan_windows.move_to_end(identity)
+    window.advance(second)
+    if window.total() >= settings.scan_rate_limit_per_minute:
         raise HTTPException(status_code=429, detail="Rate limit exceeded.")
-    queue.append(now)
+    window.buckets[second % _RATE_WINDOW_SECONDS] += 1
     if settings.scan_daily_quota <= 0:
         return
     today = datetime.now(UTC).date()
-    day, count = _scan_daily_usage.get(identity, (today, 0))
-    if day != today:
-        day, count = today, 0
+    if today != _scan_daily_bucket:
+        _scan_daily_bucket = today
+        _scan_daily_counts.clear()
+    count = _scan_daily_counts.get(identity, 0)
     if count >= settings.scan_daily_quota:
         raise HTTPException(status_code=429, detail=f"Daily quota exceeded: {settings.scan_daily_quota}")
-    _scan_daily_usage[identity] = (day, count + 1)
+    _scan_daily_counts[identity] = count + 1
+    _scan_daily_counts.move_to_end(identity)
+    if len(_scan_daily_counts) > _SCAN_WINDOWS_MAX_ENTRIES:
+        _scan_daily_counts.popitem(last=False)
+
 
+def _current_active_job(db: Session, owner: str, repo: str) -> tuple[str, str] | None:
+    """Return `(id, status)` of the newest queued/running job that is not stale yet.
+
+    Stale jobs are ignored here and failed in bulk by `_stale_job_sweeper`, so the scan
+    request path stays read-only.
+    """
 
-def _expire_stale_active_jobs(db: Session, owner: str, repo: str) -> None:
     cutoff = datetime.now(UTC) - timedelta(minutes=settings.stale_active_job_minutes)
-    stale_jobs = (
-        db.query(ScanJob)
+    row = (
+        db.query(ScanJob.id, ScanJob.status)
         .filter(
             ScanJob.repo_owner == owner,
             ScanJob.repo_name == repo,
             ScanJob.status.in_(["queued", "running"]),
-            ScanJob.created_at < cutoff,
+            ScanJob.created_at >= cutoff,
         )
-        .all()
+        .order_by(ScanJob.created_at.desc())
+        .first()
     )
-    if not stale_jobs:
-        return
+    return (row.id, row.status) if row else None
+
+
+def _expire_stale_jobs() -> int:
+    """Fail every queued/running job older than the stale threshold, across all repositories."""
+
     now = datetime.now(UTC)
-    for job in stale_jobs:
-        job.status, job.progress, job.finished_at = "failed", 100, now
-        job.error_message = "Marked as failed automatically because this scan job became stale."
-    db.commit()
+    cutoff = now - timedelta(minutes=settings.stale_active_job_minutes)
+    with SessionLocal() as db:
+        expired = (
+            db.query(ScanJob)
+            .filter(ScanJob.status.in_(["queued", "running"]), ScanJob.created_at < cutoff)
+            .update(
+                {
+                    ScanJob.status: "failed",
+                    ScanJob.progress: 100,
+                    ScanJob.finished_at: now,
+                    ScanJob.error_message: _STALE_JOB_ERROR,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+    return expired
 
 
-def _find_cached_report_for_commit(
-    owner: str,
-    repo: str,
+async def _stale_job_sweeper() -> None:
+    while True:
+        try:
+            await asyncio.to_thread(_expire_stale_jobs)
+        except SQLAlchemyError:
+            # Database briefly unavailable or locked: the next tick retries.
+            pass
+        await asyncio.sleep(_STALE_SWEEP_INTERVAL_SECONDS)
+
+
+def _cached_report_for_commit(
+    previous: dict[str, object] | None,
     commit_sha: str | None,
-    exclude_job_id: str,
 ) -> dict[str, object] | None:
-    if not commit_sha or settings.scan_cache_ttl_seconds <= 0:
+    """Reuse the latest report when it was built for the same commit within the cache TTL.
+
+    Finalizing a job prunes older reports of the same commit, so only the newest one can match.
+    """
+
+    if not previous or not commit_sha or settings.scan_cache_ttl_seconds <= 0:
         return None
-    db = SessionLocal()
-    try:
-        row = (
-            db.query(ScanReport.score_total, ScanReport.report_json, ScanJob.finished_at)
-            .join(ScanJob, ScanJob.id == ScanReport.job_id)
-            .filter(
-                ScanJob.repo_owner == owner,
-                ScanJob.repo_name == repo,
-                ScanJob.status == "done",
-                ScanJob.commit_sha == commit_sha,
-                ScanJob.id != exclude_job_id,
-            )
-            .order_by(ScanJob.finished_at.desc())
-            .first()
-        )
-        if not row or row[2] is None:
-            return None
-        age_seconds = (datetime.now(UTC) - row[2].astimezone(UTC)).total_seconds()
-        if age_seconds > settings.scan_cache_ttl_seconds:
-            return None
-        payload = json.loads(row[1])
-        if isinstance(payload, dict):
-            payload["score_total"] = int(row[0])
-            return payload
+    finished_at = previous.get("finished_at")
+    if previous.get("commit_sha") != commit_sha or not isinstance(finished_at, datetime):
         return None
-    except (ValueError, TypeError, json.JSONDecodeError):
+    age_seconds = (datetime.now(UTC) - finished_at.astimezone(UTC)).total_seconds()
+    if age_seconds > settings.scan_cache_ttl_seconds:
         return None
-    finally:
-        db.close()
+    payload = dict(previous["payload"])  # type: ignore[call-overload]
+    payload["score_total"] = previous["score_total"]
+    return payload
 
 
 def _finalize_success_job(
-    job_id: str,
+    db: Session,
+    job: ScanJob,
     owner: str,
     repo: str,
     commit_sha: str | None,
     payload: dict[str, object],
+    finished_at: datetime,
 ) -> None:
-    db = SessionLocal()
-    try:
-        job = db.get(ScanJob, job_id)
-        if not job:
-            return
-        job.status, job.progress, job.finished_at, job.commit_sha = "done", 100, datetime.now(UTC), commit_sha
-        report_row = db.get(ScanReport, job_id)
-        report_json = json.dumps(payload)
-        score = int(payload.get("score_total", 0))
-        if report_row:
-            report_row.score_total, report_row.report_json = score, report_json
-        else:
-            db.add(ScanReport(job_id=job_id, score_total=score, report_json=report_json))
-        _cleanup_repo_jobs(db, owner, repo, job_id, commit_sha, settings.repo_history_keep)
-        _metrics["scan_jobs_done_total"] += 1
-        db.commit()
-    finally:
-        db.close()
+    job_id = job.id
+    job.status, job.progress, job.finished_at, job.commit_sha = "done", 100, finished_at, commit_sha
+    job.is_latest = 1
+    report_row = db.get(ScanReport, job_id)
+    report_json = orjson.dumps(payload).decode()
+    score = int(payload.get("score_total", 0))
+    if report_row:
+        report_row.score_total, report_row.report_json = score, report_json
+    else:
+        db.add(ScanReport(job_id=job_id, score_total=score, report_json=report_json))
+    _cleanup_repo_jobs(db, owner, repo, job_id, commit_sha, settings.repo_history_keep)
+    _increment_metric("scan_jobs_done_total")
+    db.commit()
+    _evict_parsed_reports({job_id})
 
 
-def _latest_previous_report(owner: str, repo: str, exclude_job_id: str) -> dict[str, object] | None:
-    db = SessionLocal()
+def _latest_previous_report(
+    db: Session, owner: str, repo: str, exclude_job_id: str
+) -> dict[str, object] | None:
     try:
         row = (
-            db.query(ScanJob.id, ScanJob.commit_sha, ScanReport.report_json)
+            db.query(
+                ScanJob.id,
+                ScanJob.commit_sha,
+                ScanJob.finished_at,
+                ScanReport.score_total,
+                ScanReport.report_json,
+            )
             .join(ScanReport, ScanReport.job_id == ScanJob.id)
             .filter(
                 ScanJob.repo_owner == owner,
@@ -1559,14 +1915,18 @@ def _latest_previous_report(owner: str, repo: str, exclude_job_id: str) -> dict[
         )
         if not row:
             return None
-        payload = json.loads(row[2])
+        payload = orjson.loads(row.report_json)
         if not isinstance(payload, dict):
             return None
-        return {"job_id": row[0], "commit_sha": row[1], "payload": payload}
-    except (ValueError, TypeError, json.JSONDecodeError):
+        return {
+            "job_id": row.id,
+            "commit_sha": row.commit_sha,
+            "finished_at": row.finished_at,
+            "score_total": int(row.score_total),
+            "payload": payload,
+        }
+    except (ValueError, TypeError, orjson.JSONDecodeError):
         return None
-    finally:
-        db.close()
 
 
 def _extract_previous_score(previous: dict[str, object] | None) -> int | None:
@@ -1601,13 +1961,13 @@ def _build_report_comparison(
     prev_cats = {c.get("id"): c for c in _as_list(previous_payload.get("categories")) if isinstance(c, dict)}
     cur_cats = {c.get("id"): c for c in _as_list(current_payload.get("categories")) if isinstance(c, dict)}
 
+    prev_scores = {cat_id: int(cat.get("score", 0)) for cat_id, cat in prev_cats.items()}
     category_deltas: list[CategoryDeltaItem] = []
     for cat_id, cur_cat in cur_cats.items():
         if not isinstance(cat_id, str):
             continue
-        prev_cat = prev_cats.get(cat_id, {})
         cur_val = int(cur_cat.get("score", 0))
-        prev_val = int(prev_cat.get("score", 0)) if isinstance(prev_cat, dict) else 0
+        prev_val = prev_scores.get(cat_id, 0)
         if cur_val != prev_val:
             category_deltas.append(
                 CategoryDeltaItem(
@@ -1619,28 +1979,46 @@ def _build_report_comparison(
                 )
             )
 
-    factors = {"pass": 1.0, "warn": 0.5, "fail": 0.0}
-    prev_checks = _flatten_checks(prev_cats)
-    cur_checks = _flatten_checks(cur_cats)
+    prev_statuses = _check_statuses(prev_cats)
     check_deltas: list[CheckDeltaItem] = []
-    for key, cur_entry in cur_checks.items():
-        prev_entry = prev_checks.get(key)
-        prev_status = prev_entry["status"] if prev_entry else None
-        cur_status = cur_entry["status"]
-        if prev_status == cur_status:
+    for cat_id, cur_cat in cur_cats.items():
+        if not isinstance(cat_id, str):
             continue
-        weight = cur_entry["weight"]
-        delta = round(weight * (factors[cur_status] - factors.get(prev_status, 0.0)), 2)
-        check_deltas.append(
-            CheckDeltaItem(
-                category_id=cur_entry["category_id"],
-                check_id=cur_entry["check_id"],
-                check_name=cur_entry["check_name"],
-                previous_status=prev_status,  # type: ignore[arg-type]
-                current_status=cur_status,  # type: ignore[arg-type]
-                score_delta=delta,
+        raw_checks = cur_cat.get("checks")
+        if not isinstance(raw_checks, list):
+            continue
+        # One pass per category: every string id counts towards the weights, while only
+        # checks with a status can produce a delta. Exact type checks as in _check_statuses.
+        check_ids: list[str] = []
+        changed: list[tuple[str, str, str | None, dict]] = []
+        for check in raw_checks:
+            if type(check) is not dict:
+                continue
+            check_id = check.get("id")
+            if type(check_id) is not str:
+                continue
+            check_ids.append(check_id)
+            cur_status = check.get("status")
+            if type(cur_status) is not str:
+                continue
+            prev_status = prev_statuses.get((cat_id, check_id))
+            if prev_status != cur_status:
+                changed.append((check_id, cur_status, prev_status, check))
+        if not changed:
+            continue
+        weight_map = check_weight_map(cat_id, int(cur_cat.get("weight", 0)), check_ids)
+        for check_id, cur_status, prev_status, check in changed:
+            factor_delta = STATUS_FACTOR[cur_status] - STATUS_FACTOR.get(prev_status, 0.0)  # type: ignore[arg-type]
+            check_deltas.append(
+                CheckDeltaItem(
+                    category_id=cat_id,
+                    check_id=check_id,
+                    check_name=str(check.get("name", check_id)),
+                    previous_status=prev_status,  # type: ignore[arg-type]
+                    current_status=cur_status,  # type: ignore[arg-type]
+                    score_delta=round(weight_map.get(check_id, 0.0) * factor_delta, 2),
+                )
             )
-        )
     check_deltas.sort(key=lambda item: abs(item.score_delta), reverse=True)
 
     return ReportComparison(
@@ -1655,42 +2033,31 @@ def _build_report_comparison(
     )
 
 
-def _flatten_checks(categories: dict[object, object]) -> dict[str, dict[str, Any]]:
-    flat: dict[str, dict[str, Any]] = {}
+def _check_statuses(categories: dict[object, dict]) -> dict[tuple[str, str], str]:
+    # Exact type checks are safe here: payloads come from model_dump() or orjson.loads(),
+    # neither of which produces subclasses.
+    statuses: dict[tuple[str, str], str] = {}
     for category_id, category in categories.items():
-        if not isinstance(category_id, str) or not isinstance(category, dict):
+        checks = category.get("checks")
+        if type(category_id) is not str or type(checks) is not list:
             continue
-        checks = _as_list(category.get("checks"))
-        check_ids: list[str] = []
         for check in checks:
-            if not isinstance(check, dict):
-                continue
-            check_id = check.get("id")
-            if isinstance(check_id, str):
-                check_ids.append(check_id)
-        weight_map = check_weight_map(category_id, int(category.get("weight", 0)), check_ids)
-        for check in checks:
-            if not isinstance(check, dict):
+            if type(check) is not dict:
                 continue
             check_id = check.get("id")
             status = check.get("status")
-            if not isinstance(check_id, str) or not isinstance(status, str):
-                continue
-            key = f"{category_id}:{check_id}"
-            flat[key] = {
-                "category_id": category_id,
-                "check_id": check_id,
-                "check_name": str(check.get("name", check_id)),
-                "status": status,
-                "weight": weight_map.get(check_id, 0.0),
-            }
-    return flat
+            if type(check_id) is str and type(status) is str:
+                statuses[(category_id, check_id)] = status
+    return statuses
 
 
 def _as_list(value: object) -> list[object]:
     return value if isinstance(value, list) else []
 
 
+_REGRESSION_STATUSES: tuple[Literal["pass", "warn", "fail"], ...] = ("pass", "warn", "fail")
+
+
 def _score_regression_check(
     previous_score: int | None,
     current_score: int,
@@ -1698,55 +2065,38 @@ def _score_regression_check(
 ) -> CheckResult | None:
     if previous_score is None and policy.baseline_min_score is None:
         return None
-    findings: list[tuple[str, str, str | None]] = []
+    # Worst status so far as an index into _REGRESSION_STATUSES (pass < warn < fail).
+    worst = 0
+    details: list[str] = []
+    recommendation: str | None = None
     if policy.baseline_min_score is not None:
         if current_score < policy.baseline_min_score:
-            findings.append(
-                (
-                    "fail",
-                    f"Current score {current_score} is below baseline {policy.baseline_min_score}.",
-                    "Improve checks to reach baseline score threshold.",
-                )
-            )
+            worst = 2
+            details.append(f"Current score {current_score} is below baseline {policy.baseline_min_score}.")
+            recommendation = "Improve checks to reach baseline score threshold."
         else:
-            findings.append(("pass", f"Current score {current_score} meets baseline threshold.", None))
+            details.append(f"Current score {current_score} meets baseline threshold.")
     if previous_score is not None and policy.max_score_drop is not None:
         drop = previous_score - current_score
-        if drop > policy.max_score_drop:
-            findings.append(
-                (
-                    "fail",
-                    (
-                        "Score dropped by "
-                        f"{drop} points versus previous scan ({previous_score} -> {current_score})."
-                    ),
-                    "Prevent regressions by fixing failing checks before merge.",
-                )
-            )
-        elif drop > 0:
-            findings.append(
-                (
-                    "warn",
-                    (
-                        "Score dropped by "
-                        f"{drop} points versus previous scan ({previous_score} -> {current_score})."
-                    ),
-                    "Review changes that reduced quality score.",
-                )
+        if drop > 0:
+            details.append(
+                f"Score dropped by {drop} points versus previous scan ({previous_score} -> {current_score})."
             )
+            if drop > policy.max_score_drop:
+                worst = 2
+                advice = "Prevent regressions by fixing failing checks before merge."
+            else:
+                worst = max(worst, 1)
+                advice = "Review changes that reduced quality score."
+            recommendation = recommendation or advice
         else:
-            findings.append(("pass", "No score regression versus previous scan.", None))
-    status = "pass"
-    if any(item[0] == "fail" for item in findings):
-        status = "fail"
-    elif any(item[0] == "warn" for item in findings):
-        status = "warn"
+            details.append("No score regression versus previous scan.")
     return CheckResult(
         id="score_regression_guard",
         name="Score regression guard",
-        status=status,  # type: ignore[arg-type]
-        details="; ".join(item[1] for item in findings),
-        recommendation=next((item[2] for item in findings if item[2]), None),
+        status=_REGRESSION_STATUSES[worst],
+        details="; ".join(details),
+        recommendation=recommendation,
     )
 
 
@@ -1760,116 +2110,158 @@ def _cleanup_repo_jobs(
 ) -> None:
     """Prune outdated rows, keep latest and bounded history per repository."""
 
-    jobs = (
-        db.query(ScanJob)
-        .filter(ScanJob.repo_owner == owner, ScanJob.repo_name == repo)
+    # Column rows only: the current job's pending status change is not flushed yet, but it
+    # is never pruned, so the stale values read here do not matter.
+    jobs = db.execute(
+        select(ScanJob.id, ScanJob.status, ScanJob.commit_sha)
+        .where(ScanJob.repo_owner == owner, ScanJob.repo_name == repo)
         .order_by(ScanJob.finished_at.desc(), ScanJob.created_at.desc())
-        .all()
+    ).all()
+    # The caller sets `is_latest` on the current job itself; only the previous holder is reset.
+    # Inlined literal so the predicate matches the partial `ix_scan_jobs_repo_latest` index
+    # even under prepared/generic plans.
+    db.execute(
+        update(ScanJob)
+        .where(
+            ScanJob.repo_owner == owner,
+            ScanJob.repo_name == repo,
+            ScanJob.is_latest == literal_column("1"),
+            ScanJob.id != current_job_id,
+        )
+        .values(is_latest=0)
+        .execution_options(synchronize_session=False)
     )
-    for job in jobs:
-        job.is_latest = 1 if job.id == current_job_id else 0
+    # One pass: done reports of the same commit are superseded, the rest is history.
     to_delete: set[str] = set()
-    if commit_sha:
-        to_delete.update(
-            job.id
-            for job in jobs
-            if job.id != current_job_id and job.status == "done" and job.commit_sha == commit_sha
-        )
-    history_jobs = [
-        j
-        for j in jobs
-        if j.status in {"done", "failed"} and j.id != current_job_id and j.id not in to_delete
-    ]
+    history_ids: list[str] = []
+    for job_id, status, job_commit_sha in jobs:
+        if job_id == current_job_id:
+            continue
+        if commit_sha and status == "done" and job_commit_sha == commit_sha:
+            to_delete.add(job_id)
+        elif status in _PRUNABLE_STATUSES:
+            history_ids.append(job_id)
     if max_keep > 0:
-        to_delete.update(j.id for j in history_jobs[max(max_keep - 1, 0) :])
-    for job in jobs:
-        if job.id in to_delete:
-            db.delete(job)
-
-
-def _report_to_markdown(report: dict[str, object], lang: str = "en") -> str:
-    """Serialize report payload to markdown/plain text export format."""
-
-    ru = normalize_lang(lang) == "ru"
-    if ru:
-        labels = {
-            "title": f"\u041e\u0442\u0447\u0435\u0442 {settings.app_name}",
-            "repository": "\u0420\u0435\u043f\u043e\u0437\u0438\u0442\u043e\u0440\u0438\u0439",
-            "total_score": (
-                "\u0418\u0442\u043e\u0433\u043e\u0432\u0430\u044f "
-                "\u043e\u0446\u0435\u043d\u043a\u0430"
-            ),
-            "generated_at": "\u0421\u0433\u0435\u043d\u0435\u0440\u0438\u0440\u043e\u0432\u0430\u043d\u043e",
-            "comparison": "\u0421\u0440\u0430\u0432\u043d\u0435\u043d\u0438\u0435",
-            "score_delta": (
-                "\u0418\u0437\u043c\u0435\u043d\u0435\u043d\u0438\u0435 "
-                "\u043e\u0446\u0435\u043d\u043a\u0438"
-            ),
-            "previous_commit": (
-                "\u041f\u0440\u0435\u0434\u044b\u0434\u0443\u0449\u0438\u0439 "
-                "\u043a\u043e\u043c\u043c\u0438\u0442"
-            ),
-            "current_commit": (
-                "\u0422\u0435\u043a\u0443\u0449\u0438\u0439 "
-                "\u043a\u043e\u043c\u043c\u0438\u0442"
-            ),
-            "unknown": "\u041d\u0435\u0438\u0437\u0432\u0435\u0441\u0442\u043d\u043e",
-            "na": "\u043d/\u0434",
-        }
-        status_labels = {
+        to_delete.update(history_ids[max(max_keep - 1, 0) :])
+    if not to_delete:
+        return
+    # Reports go first and explicitly: the schema has no ON DELETE CASCADE to rely on.
+    delete_ids = list(to_delete)
+    for start in range(0, len(delete_ids), _DELETE_CHUNK_SIZE):
+        chunk = delete_ids[start : start + _DELETE_CHUNK_SIZE]
+        db.execute(
+            delete(ScanReport).where(ScanReport.job_id.in_(chunk)).execution_options(synchronize_session=False)
+        )
+        db.execute(delete(ScanJob).where(ScanJob.id.in_(chunk)).execution_options(synchronize_session=False))
+    _evict_parsed_reports(to_delete)
+
+
+# Export labels per language; the title is a template filled with the app name per call.
+_MD_LABELS: dict[str, dict[str, str]] = {
+    "ru": {
+        "title": "\u041e\u0442\u0447\u0435\u0442 {app_name}",
+        "repository": "\u0420\u0435\u043f\u043e\u0437\u0438\u0442\u043e\u0440\u0438\u0439",
+        "total_score": (
+            "\u0418\u0442\u043e\u0433\u043e\u0432\u0430\u044f "
+            "\u043e\u0446\u0435\u043d\u043a\u0430"
+        ),
+        "generated_at": "\u0421\u0433\u0435\u043d\u0435\u0440\u0438\u0440\u043e\u0432\u0430\u043d\u043e",
+        "comparison": "\u0421\u0440\u0430\u0432\u043d\u0435\u043d\u0438\u0435",
+        "score_delta": (
+            "\u0418\u0437\u043c\u0435\u043d\u0435\u043d\u0438\u0435 "
+            "\u043e\u0446\u0435\u043d\u043a\u0438"
+        ),
+        "previous_commit": (
+            "\u041f\u0440\u0435\u0434\u044b\u0434\u0443\u0449\u0438\u0439 "
+            "\u043a\u043e\u043c\u043c\u0438\u0442"
+        ),
+        "current_commit": (
+            "\u0422\u0435\u043a\u0443\u0449\u0438\u0439 "
+            "\u043a\u043e\u043c\u043c\u0438\u0442"
+        ),
+        "unknown": "\u041d\u0435\u0438\u0437\u0432\u0435\u0441\u0442\u043d\u043e",
+        "na": "\u043d/\u0434",
+    },
+    "en": {
+        "title": "{app_name} Report",
+        "repository": "Repository",
+        "total_score": "Total score",
+        "generated_at": "Generated at",
+        "comparison": "Comparison",
+        "score_delta": "Score delta",
+        "previous_commit": "Previous commit",
+        "current_commit": "Current commit",
+        "unknown": "Unknown",
+        "na": "n/a",
+    },
+}
+# Stored statuses are lowercase; the upper/title spellings are listed up front so the
+# export loop only lowercases statuses it does not find here.
+_MD_STATUS: dict[str, dict[str, str]] = {
+    lang: {
+        variant: label
+        for status, label in labels.items()
+        for variant in (status, status.upper(), status.title())
+    }
+    for lang, labels in {
+        "ru": {
             "pass": "\u041e\u041a",
             "warn": "\u041f\u0420\u0415\u0414",
             "fail": "\u041e\u0428\u0418\u0411",
-        }
-    else:
-        labels = {
-            "title": f"{settings.app_name} Report",
-            "repository": "Repository",
-            "total_score": "Total score",
-            "generated_at": "Generated at",
-            "comparison": "Comparison",
-            "score_delta": "Score delta",
-            "previous_commit": "Previous commit",
-            "current_commit": "Current commit",
-            "unknown": "Unknown",
-            "na": "n/a",
-        }
-        status_labels = {
+        },
+        "en": {
             "pass": "PASS",
             "warn": "WARN",
             "fail": "FAIL",
-        }
-    lines = [
-        f"# {labels['title']}",
-        "",
-        f"- {labels['repository']}: {report.get('repo_url', '')}",
-        f"- {labels['total_score']}: {report.get('score_total', 0)}/100",
-        f"- {labels['generated_at']}: {report.get('generated_at', '')}",
-        "",
-    ]
+        },
+    }.items()
+}
+
+
+def _iter_report_markdown(report: dict[str, object], lang: str = "en") -> Iterator[bytes]:
+    """Serialize report payload to markdown/plain text export format, one encoded section at a time."""
+
+    key = "ru" if normalize_lang(lang) == "ru" else "en"
+    labels = _MD_LABELS[key]
+    status_labels = _MD_STATUS[key]
+    # Sections are separated by a blank line; the body ends with a single newline.
+    yield (
+        f"# {labels['title'].format(app_name=settings.app_name)}\n"
+        "\n"
+        f"- {labels['repository']}: {report.get('repo_url', '')}\n"
+        f"- {labels['total_score']}: {report.get('score_total', 0)}/100\n"
+        f"- {labels['generated_at']}: {report.get('generated_at', '')}\n"
+    ).encode()
     comparison = report.get("comparison")
     if isinstance(comparison, dict):
-        lines.extend(
-            [
-                f"## {labels['comparison']}",
-                f"- {labels['score_delta']}: {comparison.get('score_delta', 0)}",
-                f"- {labels['previous_commit']}: {comparison.get('previous_commit_sha', labels['na'])}",
-                f"- {labels['current_commit']}: {comparison.get('current_commit_sha', labels['na'])}",
-                "",
-            ]
-        )
-    for category in _as_list(report.get("categories")):
+        yield (
+            f"\n## {labels['comparison']}\n"
+            f"- {labels['score_delta']}: {comparison.get('score_delta', 0)}\n"
+            f"- {labels['previous_commit']}: {comparison.get('previous_commit_sha', labels['na'])}\n"
+            f"- {labels['current_commit']}: {comparison.get('current_commit_sha', labels['na'])}\n"
+        ).encode()
+    unknown = labels["unknown"]
+    status_get = status_labels.get
+    # One buffer per export, drained after each category section.
+    buf = io.StringIO()
+    w = buf.write
+    categories = report.get("categories")
+    for category in categories if isinstance(categories, list) else ():
         if not isinstance(category, dict):
             continue
-        lines.append(
-            f"## {category.get('name', labels['unknown'])} "
-            f"({category.get('score', 0)}/{category.get('weight', 0)})"
-        )
-        for check in _as_list(category.get("checks")):
+        category_get = category.get
+        w(f"\n## {category_get('name', unknown)} ({category_get('score', 0)}/{category_get('weight', 0)})\n")
+        checks = category_get("checks")
+        for check in checks if isinstance(checks, list) else ():
             if not isinstance(check, dict):
                 continue
-            raw_status = str(check.get("status", "")).lower()
-            status = status_labels.get(raw_status, raw_status.upper())
-            lines.append(f"- [{status}] {check.get('name', '')}: {check.get('details', '')}")
-        lines.append("")
-    return "\n".join(lines).strip() + "\n"
+            check_get = check.get
+            raw_status = str(check_get("status", ""))
+            status = status_get(raw_status)
+            if status is None:
+                lowered = raw_status.lower()
+                status = status_get(lowered, lowered.upper())
+            w(f"- [{status}] {check_get('name', '')}: {check_get('details', '')}\n")
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
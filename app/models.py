@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -15,8 +15,26 @@ class ScanJob(Base):
     __tablename__ = "scan_jobs"
     __table_args__ = (
         Index("ix_scan_jobs_repo_status_created", "repo_owner", "repo_name", "status", "created_at"),
-        Index("ix_scan_jobs_repo_finished", "repo_owner", "repo_name", "finished_at"),
+        # History pruning reads id/status/commit_sha in this order; trailing columns make it index-only.
+        Index(
+            "ix_scan_jobs_repo_finished_created",
+            "repo_owner",
+            "repo_name",
+            "finished_at",
+            "created_at",
+            "status",
+            "commit_sha",
+            "id",
+        ),
+        Index("ix_scan_jobs_repo_status_finished", "repo_owner", "repo_name", "status", "finished_at"),
         Index("ix_scan_jobs_repo_commit", "repo_owner", "repo_name", "commit_sha"),
+        Index(
+            "ix_scan_jobs_repo_latest",
+            "repo_owner",
+            "repo_name",
+            sqlite_where=text("is_latest = 1"),
+            postgresql_where=text("is_latest = 1"),
+        ),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
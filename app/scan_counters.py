@@ -0,0 +1,102 @@
+"""Scan rate-limit counters shared between server workers.
+
+The per-process counters in `app.main` are private to each worker, so running
+`uvicorn --workers N` grants every client N times the configured limits. When
+`scan.shared_counters` points at a file (ideally on tmpfs, e.g.
+`/dev/shm/rqi_rate`), all workers memory-map the same block instead. Each client
+identity hashes to a fixed slot holding the same 60-second sliding window as the
+per-process counters (one count per second in a ring) plus the current day and its
+count. Updates hold an exclusive `flock` on the file, so concurrent workers cannot
+all pass the limit check together; slot collisions still make the numbers
+approximate, which is acceptable for abuse limits. Platforms without `fcntl`
+(Windows) update the block without that lock.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+SLOT_COUNT = 4096
+WINDOW_SECONDS = 60
+# Per slot: last second seen, day ordinal, scans on that day, then one count per second of the window.
+_HEADER_FIELDS = 3
+_SLOT_FIELDS = _HEADER_FIELDS + WINDOW_SECONDS
+_FIELD_SIZE = 8
+
+
+class SharedScanCounters:
+    """Sliding-window minute and fixed-window day counters in a memory-mapped file."""
+
+    __slots__ = ("_fd", "_map", "_slots", "_values")
+
+    def __init__(self, path: str, slots: int = SLOT_COUNT) -> None:
+        size = slots * _SLOT_FIELDS * _FIELD_SIZE
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            # Grow only: a worker started with a smaller SLOT_COUNT must not truncate live counters.
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        # Kept open for `flock`, which locks the file across worker processes.
+        self._fd = fd
+        self._slots = slots
+        self._values = memoryview(self._map).cast("Q")
+
+    def close(self) -> None:
+        self._values.release()
+        self._map.close()
+        os.close(self._fd)
+
+    def acquire(self, identity: str, second: int, per_minute: int, day: int, per_day: int) -> str | None:
+        """Count one scan for `identity` at unix time `second`.
+
+        Returns `"minute"` or `"day"` when the corresponding limit blocks the scan,
+        otherwise `None`. A non-positive `per_day` disables the daily quota.
+        """
+
+        # crc32 rather than hash(): str hashes are salted per process.
+        base = (zlib.crc32(identity.encode()) % self._slots) * _SLOT_FIELDS
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            return self._acquire_locked(base, second, per_minute, day, per_day)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _acquire_locked(self, base: int, second: int, per_minute: int, day: int, per_day: int) -> str | None:
+        values = self._values
+        ring = base + _HEADER_FIELDS
+        last_second = values[base]
+        elapsed = second - last_second
+        # A far-future timestamp can only be garbage (e.g. an older file layout): reset it too.
+        if elapsed >= WINDOW_SECONDS or elapsed <= -WINDOW_SECONDS:
+            for index in range(ring, ring + WINDOW_SECONDS):
+                values[index] = 0
+            values[base] = second
+        elif elapsed > 0:
+            for offset in range(1, elapsed + 1):
+                values[ring + (last_second + offset) % WINDOW_SECONDS] = 0
+            values[base] = second
+        if sum(values[ring : ring + WINDOW_SECONDS]) >= per_minute:
+            return "minute"
+        values[ring + second % WINDOW_SECONDS] += 1
+        if per_day <= 0:
+            return None
+        if values[base + 1] != day:
+            values[base + 1] = day
+            values[base + 2] = 0
+        if values[base + 2] >= per_day:
+            return "day"
+        values[base + 2] += 1
+        return None
@@ -2,27 +2,39 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import re
+import sqlite3
+import threading
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
 import httpx
+import orjson
 import yaml
 
-from app.scanner.policy import RepoPolicy, apply_ignore_checks
+from app.config import SETTINGS
+from app.scanner.osv_cache import OsvCache
+from app.scanner.policy import YAML_LOADER, RepoPolicy, apply_ignore_checks
 from app.scanner.schemas import CheckResult, ExtensionMetric, ProjectMetrics
 
-PINNED_SHA_RE = re.compile(r"^[a-fA-F0-9]{40}$")
-USES_RE = re.compile(r"uses:\s*([A-Za-z0-9_.\-\/]+)@([^\s#]+)")
+# Captures the ref of every `uses: owner/action@ref` that is not a full 40-hex commit SHA
+# (expression refs like `${{ ... }}` included).
+UNPINNED_USES_RE = re.compile(r"uses:\s*[A-Za-z0-9_.\-\/]+@(?![a-fA-F0-9]{40}(?![^\s#]))([^\s#]+)")
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}")
 SECRET_PATTERNS = {
     "AWS Access Key": re.compile(r"AKIA[0-9A-Z]{16}"),
     "GitHub Token": re.compile(r"ghp_[A-Za-z0-9]{20,}"),
     "Google API Key": re.compile(r"AIza[0-9A-Za-z\-_]{20,}"),
 }
+# Literal prefix of each pattern above, in the same order: a pattern only runs on files
+# that contain its prefix. Patterns still scan separately, so overlapping tokens all count.
+SECRET_PREFIXES = ("AKIA", "ghp_", "AIza")
+_SECRET_SCANS = tuple(zip(SECRET_PATTERNS, SECRET_PREFIXES, SECRET_PATTERNS.values(), strict=True))
+PUSH_OR_PR_TRIGGERS = frozenset({"push", "pull_request"})
 CHANGELOG_FILENAMES = {"changelog.md", "changes.md", "history.md", "releases.md"}
 TEST_EXECUTION_KEYWORDS = (
     "pytest",
@@ -38,10 +50,34 @@ TEST_EXECUTION_KEYWORDS = (
     "cargo test",
     "flutter test",
 )
+# Keywords searched in the lowercased workflow text; each stage counts once.
+CI_STAGE_KEYWORDS = {
+    "lint": ("lint", "ruff", "flake8", "eslint", "checkstyle", "stylecop", "clang-tidy"),
+    "test": ("test", "pytest", "jest", "vitest", "dotnet test", "mvn test", "gradle test", "ctest"),
+    "build": ("build", "compile", "package", "dotnet build", "mvn package", "cmake"),
+    "release": ("release", "publish", "deploy", "upload-artifact", "gh release"),
+}
+CI_CACHE_MARKERS = (
+    "actions/cache@",
+    "cache: pip",
+    "cache: npm",
+    "cache: yarn",
+    "cache: pnpm",
+    "cache: gradle",
+    "cache: maven",
+    "cache-dependency-path",
+)
 
 OSV_QUERY_URL = "https://api.osv.dev/v1/querybatch"
 MAX_DEPENDENCIES_FOR_OSV = 200
 OSV_BATCH_SIZE = 100
+OSV_MAX_CONNECTIONS = 8
+OSV_MAX_ATTEMPTS = 3
+OSV_RETRY_BASE_DELAY_SECONDS = 0.5
+OSV_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_osv_cache: OsvCache | None = None
+_osv_cache_path: str | None = None
+_osv_cache_lock = threading.Lock()
 EXTENSIONLESS_CODE_FILES = {
     "dockerfile",
     "makefile",
@@ -60,133 +96,146 @@ class DependencyRef:
     version: str
 
 
-def _find_first_path(tree_paths: list[str], predicate: Callable[[str], bool]) -> str | None:
-    """Return first path matching provided predicate."""
+@dataclass(frozen=True)
+class TreeIndex:
+    """Lowercased views of a repository tree, built once and shared by the checkers."""
 
-    for path in tree_paths:
-        if predicate(path.lower()):
-            return path
-    return None
+    paths: tuple[str, ...]
+    lower_paths: tuple[str, ...]
+    names: tuple[str, ...]
+    name_set: frozenset[str]
+
+    @classmethod
+    def from_paths(cls, tree_paths: list[str]) -> TreeIndex:
+        lower_paths = tuple(path.lower() for path in tree_paths)
+        names = tuple(path.rpartition("/")[2] for path in lower_paths)
+        return cls(tuple(tree_paths), lower_paths, names, frozenset(names))
 
+    def first_path_by_name(self, predicate: Callable[[str], bool]) -> str | None:
+        """Return the original path of the first entry whose lowercased file name matches."""
 
-def detect_stacks(snapshot: Any) -> list[str]:
+        for path, name in zip(self.paths, self.names, strict=True):
+            if predicate(name):
+                return path
+        return None
+
+    def first_path_with_suffix(self, suffix: str) -> str | None:
+        """Return the original path of the first entry whose lowercased path ends with `suffix`."""
+
+        for path, lower in zip(self.paths, self.lower_paths, strict=True):
+            if lower.endswith(suffix):
+                return path
+        return None
+
+
+@dataclass(frozen=True)
+class WorkflowTexts:
+    """Workflow file contents plus their lowercased concatenation for keyword searches."""
+
+    contents: tuple[str, ...]
+    combined_lower: str
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Any) -> WorkflowTexts:
+        contents = tuple(snapshot.file_contents.get(path, "") for path in snapshot.workflow_paths)
+        return cls(contents, "\n".join(contents).lower())
+
+
+# Path suffixes that mark each stack, in report order. Entries starting with a dot are
+# extensions and are looked up by dict; the rest are file-name suffixes.
+_STACK_SUFFIXES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("python", (".py", "pyproject.toml", "requirements.txt", "poetry.lock")),
+    ("html", (".html", ".htm")),
+    ("css", (".css", ".scss", ".sass", ".less")),
+    ("typescript", (".ts", ".tsx", ".mts", ".cts", "tsconfig.json")),
+    (
+        "javascript",
+        ("package.json", "pnpm-lock.yaml", "yarn.lock", "package-lock.json", ".js", ".jsx", ".mjs", ".cjs"),
+    ),
+    ("java", ("pom.xml", "build.gradle", "build.gradle.kts")),
+    ("csharp", (".csproj", ".sln", "directory.build.props")),
+    ("c", (".c",)),
+    ("cpp", (".cpp", ".cc", ".cxx", ".hpp", ".hh", ".hxx", "cmakelists.txt")),
+    ("go", ("go.mod", ".go")),
+    ("rust", ("cargo.toml", "cargo.lock", ".rs")),
+    ("php", ("composer.json", "composer.lock", ".php")),
+    ("ruby", ("gemfile", "gemfile.lock", ".rb")),
+    ("dart", ("pubspec.yaml", "pubspec.lock", ".dart")),
+    ("kotlin", (".kt", ".kts")),
+    ("swift", ("package.swift", ".swift")),
+    ("objective-c", (".m", ".mm")),
+    ("fsharp", (".fs", ".fsi", ".fsx")),
+    ("perl", (".pl", ".pm")),
+    ("scala", (".scala", ".sbt", ".sc")),
+    ("sql", (".sql",)),
+    ("shell", (".sh", ".bash", ".zsh", ".fish")),
+    ("powershell", (".ps1", ".psm1", ".psd1")),
+    ("lua", (".lua",)),
+    ("r", (".r", ".rmd")),
+    ("julia", (".jl",)),
+    ("clojure", (".clj", ".cljs", ".cljc")),
+    ("elixir", (".ex", ".exs")),
+    ("haskell", (".hs",)),
+    ("nim", (".nim",)),
+    ("zig", (".zig",)),
+    ("solidity", (".sol",)),
+    ("terraform", (".tf", ".hcl")),
+)
+_STACK_ORDER = (*(stack for stack, _ in _STACK_SUFFIXES), "docker")
+_STACK_BY_EXTENSION = {
+    suffix: stack for stack, suffixes in _STACK_SUFFIXES for suffix in suffixes if suffix.startswith(".")
+}
+_STACK_BY_NAME_SUFFIX = tuple(
+    (suffix, stack)
+    for stack, suffixes in _STACK_SUFFIXES
+    for suffix in suffixes
+    if not suffix.startswith(".")
+)
+_STACK_NAME_SUFFIXES = tuple(suffix for suffix, _ in _STACK_BY_NAME_SUFFIX)
+
+
+def detect_stacks(snapshot: Any, index: TreeIndex | None = None) -> list[str]:
     """Infer primary technology stacks from repository tree."""
 
-    tree = [path.lower() for path in snapshot.tree_paths]
-    filenames = [path.split("/")[-1] for path in tree]
-    stacks: list[str] = []
-
-    if any(path.endswith((".py", "pyproject.toml", "requirements.txt", "poetry.lock")) for path in tree):
-        stacks.append("python")
-    if any(path.endswith((".html", ".htm")) for path in tree):
-        stacks.append("html")
-    if any(path.endswith((".css", ".scss", ".sass", ".less")) for path in tree):
-        stacks.append("css")
-    if any(path.endswith((".ts", ".tsx", ".mts", ".cts", "tsconfig.json")) for path in tree):
-        stacks.append("typescript")
-    if any(
-        path.endswith(
-            (
-                "package.json",
-                "pnpm-lock.yaml",
-                "yarn.lock",
-                "package-lock.json",
-                ".js",
-                ".jsx",
-                ".mjs",
-                ".cjs",
-            )
-        )
-        for path in tree
-    ):
-        stacks.append("javascript")
-    if any(path.endswith(("pom.xml", "build.gradle", "build.gradle.kts")) for path in tree):
-        stacks.append("java")
-    if any(path.endswith((".csproj", ".sln", "directory.build.props")) for path in tree):
-        stacks.append("csharp")
-    if any(path.endswith((".c",)) for path in tree):
-        stacks.append("c")
-    if any(path.endswith((".cpp", ".cc", ".cxx", ".hpp", ".hh", ".hxx", "cmakelists.txt")) for path in tree):
-        stacks.append("cpp")
-    if any(path.endswith(("go.mod", ".go")) for path in tree):
-        stacks.append("go")
-    if any(path.endswith(("cargo.toml", "cargo.lock", ".rs")) for path in tree):
-        stacks.append("rust")
-    if any(path.endswith(("composer.json", "composer.lock", ".php")) for path in tree):
-        stacks.append("php")
-    if any(path.endswith(("gemfile", "gemfile.lock", ".rb")) for path in tree):
-        stacks.append("ruby")
-    if any(path.endswith(("pubspec.yaml", "pubspec.lock", ".dart")) for path in tree):
-        stacks.append("dart")
-    if any(path.endswith((".kt", ".kts")) for path in tree):
-        stacks.append("kotlin")
-    if any(path.endswith(("package.swift", ".swift")) for path in tree):
-        stacks.append("swift")
-    if any(path.endswith((".m", ".mm")) for path in tree):
-        stacks.append("objective-c")
-    if any(path.endswith((".fs", ".fsi", ".fsx")) for path in tree):
-        stacks.append("fsharp")
-    if any(path.endswith((".pl", ".pm")) for path in tree):
-        stacks.append("perl")
-    if any(path.endswith((".scala", ".sbt", ".sc")) for path in tree):
-        stacks.append("scala")
-    if any(path.endswith((".sql",)) for path in tree):
-        stacks.append("sql")
-    if any(path.endswith((".sh", ".bash", ".zsh", ".fish")) for path in tree):
-        stacks.append("shell")
-    if any(path.endswith((".ps1", ".psm1", ".psd1")) for path in tree):
-        stacks.append("powershell")
-    if any(path.endswith((".lua",)) for path in tree):
-        stacks.append("lua")
-    if any(path.endswith((".r", ".rmd")) for path in tree):
-        stacks.append("r")
-    if any(path.endswith((".jl",)) for path in tree):
-        stacks.append("julia")
-    if any(path.endswith((".clj", ".cljs", ".cljc")) for path in tree):
-        stacks.append("clojure")
-    if any(path.endswith((".ex", ".exs")) for path in tree):
-        stacks.append("elixir")
-    if any(path.endswith((".hs",)) for path in tree):
-        stacks.append("haskell")
-    if any(path.endswith((".nim",)) for path in tree):
-        stacks.append("nim")
-    if any(path.endswith((".zig",)) for path in tree):
-        stacks.append("zig")
-    if any(path.endswith((".sol",)) for path in tree):
-        stacks.append("solidity")
-    if any(path.endswith((".tf", ".hcl")) for path in tree):
-        stacks.append("terraform")
-    if any(name.startswith("dockerfile") for name in filenames):
-        stacks.append("docker")
-    if not stacks:
-        stacks.append("unknown")
-    return stacks
+    if index is None:
+        index = TreeIndex.from_paths(snapshot.tree_paths)
+    found: set[str] = set()
+    for name in index.name_set:
+        dot = name.rfind(".")
+        if dot >= 0:
+            stack = _STACK_BY_EXTENSION.get(name[dot:])
+            if stack is not None:
+                found.add(stack)
+        if name.endswith(_STACK_NAME_SUFFIXES):
+            found.update(stack for suffix, stack in _STACK_BY_NAME_SUFFIX if name.endswith(suffix))
+        if name.startswith("dockerfile"):
+            found.add("docker")
+    stacks = [stack for stack in _STACK_ORDER if stack in found]
+    return stacks or ["unknown"]
 
 
 def project_line_metrics(snapshot: Any) -> ProjectMetrics:
     """Calculate scanned code lines/files grouped by file extension."""
 
-    stats: dict[str, dict[str, int]] = {}
-    total_lines = 0
-    scanned_files = 0
+    # Two flat int maps: cheaper per file than a nested dict or Counter.
+    files_per_ext: dict[str, int] = {}
+    lines_per_ext: dict[str, int] = {}
+    file_contents = snapshot.file_contents
 
     for path in snapshot.line_count_paths:
-        content = snapshot.file_contents.get(path)
+        content = file_contents.get(path)
         if content is None:
             continue
         extension = _extension(path)
-        lines = _count_lines(content)
-        scanned_files += 1
-        total_lines += lines
-        bucket = stats.setdefault(extension, {"files": 0, "lines": 0})
-        bucket["files"] += 1
-        bucket["lines"] += lines
+        files_per_ext[extension] = files_per_ext.get(extension, 0) + 1
+        lines_per_ext[extension] = lines_per_ext.get(extension, 0) + _count_lines(content)
 
     by_extension = [
-        ExtensionMetric(extension=ext, files=data["files"], lines=data["lines"])
-        for ext, data in stats.items()
+        ExtensionMetric(extension=ext, files=files, lines=lines_per_ext[ext])
+        for ext, files in sorted(files_per_ext.items(), key=lambda item: (-lines_per_ext[item[0]], item[0]))
     ]
-    by_extension.sort(key=lambda item: (-item.lines, item.extension))
+    total_lines = sum(lines_per_ext.values())
+    scanned_files = sum(files_per_ext.values())
     return ProjectMetrics(
         total_code_files=snapshot.line_count_candidates_total,
         total_code_lines=total_lines,
@@ -196,11 +245,16 @@ def project_line_metrics(snapshot: Any) -> ProjectMetrics:
     )
 
 
-def docs_checks(snapshot: Any, readme_min_length: int = 200) -> list[CheckResult]:
+def docs_checks(
+    snapshot: Any,
+    readme_min_length: int = 200,
+    index: TreeIndex | None = None,
+) -> list[CheckResult]:
     """Run documentation and license checks."""
 
-    tree_paths = snapshot.tree_paths
-    readme_path = _find_first_path(tree_paths, lambda p: p.split("/")[-1].startswith("readme."))
+    if index is None:
+        index = TreeIndex.from_paths(snapshot.tree_paths)
+    readme_path = index.first_path_by_name(lambda name: name.startswith("readme."))
     readme_content = snapshot.file_contents.get(readme_path, "") if readme_path else ""
 
     checks: list[CheckResult] = []
@@ -226,7 +280,7 @@ def docs_checks(snapshot: Any, readme_min_length: int = 200) -> list[CheckResult
             ),
         )
     )
-    contributing_path = _find_first_path(tree_paths, lambda p: p.split("/")[-1] == "contributing.md")
+    contributing_path = index.first_path_by_name(lambda name: name == "contributing.md")
     checks.append(
         CheckResult(
             id="contributing_exists",
@@ -248,10 +302,7 @@ def docs_checks(snapshot: Any, readme_min_length: int = 200) -> list[CheckResult
         )
     )
 
-    changelog_path = _find_first_path(
-        tree_paths,
-        lambda p: p.split("/")[-1] in CHANGELOG_FILENAMES,
-    )
+    changelog_path = index.first_path_by_name(lambda name: name in CHANGELOG_FILENAMES)
     checks.append(
         CheckResult(
             id="changelog_exists",
@@ -262,7 +313,7 @@ def docs_checks(snapshot: Any, readme_min_length: int = 200) -> list[CheckResult
         )
     )
 
-    has_docs_dir = any(path.lower().startswith(("docs/", "doc/")) for path in tree_paths)
+    has_docs_dir = any(path.startswith(("docs/", "doc/")) for path in index.lower_paths)
     checks.append(
         CheckResult(
             id="docs_dir_exists",
@@ -306,11 +357,13 @@ def docs_checks(snapshot: Any, readme_min_length: int = 200) -> list[CheckResult
     return checks
 
 
-def ci_checks(snapshot: Any) -> list[CheckResult]:
+def ci_checks(snapshot: Any, workflow_texts: WorkflowTexts | None = None) -> list[CheckResult]:
     """Run CI/workflow quality checks."""
 
+    if workflow_texts is None:
+        workflow_texts = WorkflowTexts.from_snapshot(snapshot)
     workflows = snapshot.workflow_paths
-    workflow_contents = [snapshot.file_contents.get(path, "") for path in workflows]
+    workflow_contents = workflow_texts.contents
 
     checks: list[CheckResult] = []
     has_workflows = bool(workflows)
@@ -339,13 +392,7 @@ def ci_checks(snapshot: Any) -> list[CheckResult]:
             if not content.strip():
                 continue
             try:
-                for doc in yaml.safe_load_all(content):
-                    if not isinstance(doc, dict):
-                        continue
-                    on_config = _extract_workflow_on_config(doc)
-                    if _has_push_or_pr_trigger(on_config):
-                        found_trigger = True
-                        break
+                found_trigger = _workflow_has_push_or_pr_trigger(content)
             except yaml.YAMLError:
                 parse_errors += 1
             if found_trigger:
@@ -369,17 +416,10 @@ def ci_checks(snapshot: Any) -> list[CheckResult]:
         )
     )
 
-    stage_keywords = {
-        "lint": ("lint", "ruff", "flake8", "eslint", "checkstyle", "stylecop", "clang-tidy"),
-        "test": ("test", "pytest", "jest", "vitest", "dotnet test", "mvn test", "gradle test", "ctest"),
-        "build": ("build", "compile", "package", "dotnet build", "mvn package", "cmake"),
-        "release": ("release", "publish", "deploy", "upload-artifact", "gh release"),
-    }
-    combined = "\n".join(workflow_contents).lower()
-    covered = 0
-    for keywords in stage_keywords.values():
-        if any(keyword in combined for keyword in keywords):
-            covered += 1
+    combined = workflow_texts.combined_lower
+    covered = sum(
+        1 for keywords in CI_STAGE_KEYWORDS.values() if any(keyword in combined for keyword in keywords)
+    )
 
     if not has_workflows:
         coverage_status = "fail"
@@ -430,17 +470,7 @@ def ci_checks(snapshot: Any) -> list[CheckResult]:
         )
     )
 
-    cache_markers = (
-        "actions/cache@",
-        "cache: pip",
-        "cache: npm",
-        "cache: yarn",
-        "cache: pnpm",
-        "cache: gradle",
-        "cache: maven",
-        "cache-dependency-path",
-    )
-    has_ci_cache = any(marker in combined for marker in cache_markers)
+    has_ci_cache = any(marker in combined for marker in CI_CACHE_MARKERS)
     checks.append(
         CheckResult(
             id="ci_cache_configured",
@@ -478,20 +508,29 @@ def ci_checks(snapshot: Any) -> list[CheckResult]:
     return checks
 
 
-def quality_checks(snapshot: Any) -> list[CheckResult]:
+def quality_checks(
+    snapshot: Any,
+    index: TreeIndex | None = None,
+    workflow_texts: WorkflowTexts | None = None,
+) -> list[CheckResult]:
     """Run test and lint configuration checks across ecosystems."""
 
-    tree_paths_lower = [path.lower() for path in snapshot.tree_paths]
-    pyproject_path = next((p for p in snapshot.tree_paths if p.lower().endswith("pyproject.toml")), None)
+    if index is None:
+        index = TreeIndex.from_paths(snapshot.tree_paths)
+    if workflow_texts is None:
+        workflow_texts = WorkflowTexts.from_snapshot(snapshot)
+    tree_paths_lower = index.lower_paths
+    pyproject_path = index.first_path_with_suffix("pyproject.toml")
     pyproject_content = snapshot.file_contents.get(pyproject_path, "") if pyproject_path else ""
-    package_json_path = next((p for p in snapshot.tree_paths if p.lower().endswith("package.json")), None)
+    package_json_path = index.first_path_with_suffix("package.json")
     package_json_content = snapshot.file_contents.get(package_json_path, "") if package_json_path else ""
-    pubspec_path = next((p for p in snapshot.tree_paths if p.lower().endswith("pubspec.yaml")), None)
+    pubspec_path = index.first_path_with_suffix("pubspec.yaml")
     pubspec_content = snapshot.file_contents.get(pubspec_path, "") if pubspec_path else ""
-    java_build_paths = []
-    for path in snapshot.tree_paths:
-        if path.lower().endswith(("pom.xml", "build.gradle", "build.gradle.kts")):
-            java_build_paths.append(path)
+    java_build_paths = [
+        path
+        for path, lower in zip(index.paths, tree_paths_lower, strict=True)
+        if lower.endswith(("pom.xml", "build.gradle", "build.gradle.kts"))
+    ]
     java_build_content = "\n".join(snapshot.file_contents.get(path, "") for path in java_build_paths)
 
     lint_config_filenames = {
@@ -536,7 +575,7 @@ def quality_checks(snapshot: Any) -> list[CheckResult]:
         marker in pubspec_content.lower()
         for marker in ("flutter_lints", "package:lints", "dart_code_metrics")
     )
-    has_generic_lint_file = any(path.split("/")[-1] in lint_config_filenames for path in tree_paths_lower)
+    has_generic_lint_file = not index.name_set.isdisjoint(lint_config_filenames)
 
     has_lint_config = any(
         [
@@ -574,13 +613,11 @@ def quality_checks(snapshot: Any) -> list[CheckResult]:
     )
     has_test_files = any(
         (
-            "test" in path.split("/")[-1]
-            or path.split("/")[-1].endswith(
-                (".spec.js", ".spec.ts", ".spec.jsx", ".spec.tsx", ".spec.dart", "_test.dart")
-            )
+            "test" in name
+            or name.endswith((".spec.js", ".spec.ts", ".spec.jsx", ".spec.tsx", ".spec.dart", "_test.dart"))
         )
-        and path.endswith(test_file_exts)
-        for path in tree_paths_lower
+        and name.endswith(test_file_exts)
+        for name in index.name_set
     )
     has_test_config = any(
         path.endswith(
@@ -598,10 +635,7 @@ def quality_checks(snapshot: Any) -> list[CheckResult]:
     has_flutter_test_dependency = "flutter_test" in pubspec_content.lower()
     has_tests = has_tests_dir or has_test_files or has_test_config or has_flutter_test_dependency
     has_editorconfig = any(path.endswith(".editorconfig") for path in tree_paths_lower)
-    workflow_combined = "\n".join(
-        snapshot.file_contents.get(path, "")
-        for path in snapshot.workflow_paths
-    ).lower()
+    workflow_combined = workflow_texts.combined_lower
     has_tests_in_ci = any(keyword in workflow_combined for keyword in TEST_EXECUTION_KEYWORDS)
 
     checks = [
@@ -665,20 +699,20 @@ def security_checks(
     snapshot: Any,
     enable_network: bool = False,
     policy: RepoPolicy | None = None,
+    index: TreeIndex | None = None,
+    workflow_texts: WorkflowTexts | None = None,
 ) -> list[CheckResult]:
     """Run action pinning and secret leakage checks."""
 
     policy = policy or RepoPolicy()
-    workflow_contents = [snapshot.file_contents.get(path, "") for path in snapshot.workflow_paths]
+    if index is None:
+        index = TreeIndex.from_paths(snapshot.tree_paths)
+    if workflow_texts is None:
+        workflow_texts = WorkflowTexts.from_snapshot(snapshot)
+    workflow_contents = workflow_texts.contents
     unpinned_actions: list[str] = []
-
     for content in workflow_contents:
-        for _, ref in USES_RE.findall(content):
-            if ref.startswith("${{"):
-                unpinned_actions.append(ref)
-                continue
-            if not PINNED_SHA_RE.match(ref):
-                unpinned_actions.append(ref)
+        unpinned_actions.extend(UNPINNED_USES_RE.findall(content))
 
     if not snapshot.workflow_paths:
         action_status = "warn"
@@ -696,7 +730,7 @@ def security_checks(
     secrets_found: list[str] = []
     for path, content in snapshot.file_contents.items():
         lower = path.lower()
-        filename = lower.split("/")[-1]
+        filename = lower.rpartition("/")[2]
         if not (
             filename.startswith("readme.")
             or lower.startswith(".github/workflows/")
@@ -707,10 +741,11 @@ def security_checks(
             or lower.endswith("build.gradle")
         ):
             continue
-        for label, pattern in SECRET_PATTERNS.items():
+        for label, prefix, pattern in _SECRET_SCANS:
+            if prefix not in content:
+                continue
             for match in pattern.finditer(content):
-                token_value = match.group(0)
-                if policy.is_secret_allowed(path, token_value):
+                if policy.is_secret_allowed(path, match.group(0)):
                     continue
                 secrets_found.append(f"{label} in {path}")
 
@@ -731,8 +766,8 @@ def security_checks(
         "cargo.lock",
         "pubspec.lock",
     }
-    has_lockfile = any(path.lower().split("/")[-1] in lockfile_names for path in snapshot.tree_paths)
-    has_dependabot = any(path.lower() == ".github/dependabot.yml" for path in snapshot.tree_paths)
+    has_lockfile = not index.name_set.isdisjoint(lockfile_names)
+    has_dependabot = ".github/dependabot.yml" in index.lower_paths
     if has_lockfile and has_dependabot:
         dep_status = "pass"
         dep_details = "Dependency lockfile and dependabot config detected."
@@ -765,7 +800,7 @@ def security_checks(
         permissions_details = "All workflow files define explicit permissions."
         permissions_rec = None
 
-    security_path = _find_first_path(snapshot.tree_paths, lambda p: p.split("/")[-1] == "security.md")
+    security_path = index.first_path_by_name(lambda name: name == "security.md")
     security_content = snapshot.file_contents.get(security_path, "") if security_path else ""
     has_security_contact = bool(EMAIL_RE.search(security_content)) or any(
         marker in security_content.lower()
@@ -891,7 +926,7 @@ def extract_dependency_refs(snapshot: Any) -> list[DependencyRef]:
     refs: set[DependencyRef] = set()
     for path, content in snapshot.file_contents.items():
         lower = path.lower()
-        filename = lower.split("/")[-1]
+        filename = lower.rpartition("/")[2]
         if filename in {"requirements.txt", "requirements-dev.txt"}:
             refs.update(_parse_requirements(content))
         elif filename == "poetry.lock":
@@ -919,41 +954,143 @@ def extract_dependency_refs(snapshot: Any) -> list[DependencyRef]:
 
 
 def query_osv_for_dependencies(dependencies: list[DependencyRef]) -> list[dict[str, str]]:
-    """Batch query OSV API for dependency vulnerabilities."""
-
-    findings: list[dict[str, str]] = []
-    with httpx.Client(timeout=httpx.Timeout(20.0)) as client:
-        for chunk_start in range(0, len(dependencies), OSV_BATCH_SIZE):
-            chunk = dependencies[chunk_start : chunk_start + OSV_BATCH_SIZE]
-            queries = [
-                {
-                    "package": {"name": dep.name, "ecosystem": dep.ecosystem},
-                    "version": dep.version,
-                }
-                for dep in chunk
-            ]
-            response = client.post(OSV_QUERY_URL, json={"queries": queries})
-            response.raise_for_status()
-            data = response.json()
-            results = data.get("results", [])
-            for dep, result in zip(chunk, results, strict=False):
-                vulns = result.get("vulns", []) if isinstance(result, dict) else []
-                for vuln in vulns:
-                    vuln_id = vuln.get("id")
-                    if not vuln_id:
-                        continue
-                    findings.append(
-                        {
-                            "id": str(vuln_id),
-                            "package": f"{dep.ecosystem}:{dep.name}@{dep.version}",
-                        }
-                    )
-    return findings
-
-
-def maintenance_checks(snapshot: Any, stale_days: int = 180) -> list[CheckResult]:
+    """Batch query OSV API for dependency vulnerabilities.
+
+    Answers younger than `scan.osv_cache_ttl_seconds` come from the optional on-disk
+    cache; only the remaining dependencies are sent to OSV through `_query_osv_async`.
+    Blocks the caller until the answers arrive, also when called from a coroutine.
+    """
+
+    cache = _get_osv_cache()
+    keys = {dep: (dep.ecosystem, dep.name, dep.version) for dep in dependencies}
+    known: dict[tuple[str, str, str], list[str]] = {}
+    if cache is not None:
+        try:
+            known = cache.get_many(keys.values(), SETTINGS.scan_osv_cache_ttl_seconds)
+        except sqlite3.Error:
+            known = {}
+    missing = [dep for dep, key in keys.items() if key not in known]
+    if missing:
+        fetched = {keys[dep]: vuln_ids for dep, vuln_ids in _run_osv_query(missing).items()}
+        if cache is not None:
+            try:
+                cache.put_many(fetched)
+            except sqlite3.Error:
+                pass
+        known.update(fetched)
+
+    return [
+        {"id": vuln_id, "package": f"{dep.ecosystem}:{dep.name}@{dep.version}"}
+        for dep, key in keys.items()
+        for vuln_id in known.get(key, ())
+    ]
+
+
+def _run_osv_query(dependencies: list[DependencyRef]) -> dict[DependencyRef, list[str]]:
+    """Run `_query_osv_async` to completion from synchronous code."""
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_query_osv_async(dependencies))
+    # asyncio.run cannot nest inside a running loop (e.g. a script calling run_all_checks
+    # from a coroutine), so the query gets its own loop in a worker thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, _query_osv_async(dependencies)).result()
+
+
+def _get_osv_cache() -> OsvCache | None:
+    """Open the configured OSV cache once per process; `None` when disabled or unusable."""
+
+    global _osv_cache, _osv_cache_path
+
+    path = SETTINGS.scan_osv_cache_path
+    if not path:
+        return None
+    with _osv_cache_lock:
+        if _osv_cache_path != path:
+            if _osv_cache is not None:
+                _osv_cache.close()
+            _osv_cache_path = path
+            try:
+                _osv_cache = OsvCache(path)
+            except (OSError, sqlite3.Error):
+                _osv_cache = None
+        return _osv_cache
+
+
+def close_osv_cache() -> None:
+    """Close the process-wide OSV cache connection, if one was opened."""
+
+    global _osv_cache, _osv_cache_path
+
+    with _osv_cache_lock:
+        if _osv_cache is not None:
+            _osv_cache.close()
+        _osv_cache = None
+        _osv_cache_path = None
+
+
+async def _query_osv_async(dependencies: list[DependencyRef]) -> dict[DependencyRef, list[str]]:
+    """Send all OSV batches concurrently over one pooled client; map each answered dependency to its ids."""
+
+    chunks = [
+        dependencies[chunk_start : chunk_start + OSV_BATCH_SIZE]
+        for chunk_start in range(0, len(dependencies), OSV_BATCH_SIZE)
+    ]
+    async with httpx.AsyncClient(
+        timeout=httpx.Timeout(20.0),
+        limits=httpx.Limits(max_connections=OSV_MAX_CONNECTIONS),
+    ) as client:
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(_post_osv_batch(client, chunk)) for chunk in chunks]
+        except ExceptionGroup as exc:
+            # Re-raise the first batch failure itself so the check reports a readable reason.
+            raise exc.exceptions[0] from None
+
+    vuln_ids_by_dep: dict[DependencyRef, list[str]] = {}
+    for chunk, task in zip(chunks, tasks, strict=True):
+        for dep, result in zip(chunk, task.result(), strict=False):
+            vulns = result.get("vulns", []) if isinstance(result, dict) else []
+            vuln_ids_by_dep[dep] = [str(vuln["id"]) for vuln in vulns if vuln.get("id")]
+    return vuln_ids_by_dep
+
+
+async def _post_osv_batch(client: httpx.AsyncClient, chunk: list[DependencyRef]) -> list[Any]:
+    """Post one OSV batch, retrying transport, rate-limit and server errors with exponential backoff."""
+
+    queries = [
+        {
+            "package": {"name": dep.name, "ecosystem": dep.ecosystem},
+            "version": dep.version,
+        }
+        for dep in chunk
+    ]
+    for attempt in range(OSV_MAX_ATTEMPTS):
+        last_attempt = attempt == OSV_MAX_ATTEMPTS - 1
+        try:
+            response = await client.post(OSV_QUERY_URL, json={"queries": queries})
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+        else:
+            if response.status_code not in OSV_RETRY_STATUSES or last_attempt:
+                break
+        await asyncio.sleep(OSV_RETRY_BASE_DELAY_SECONDS * 2**attempt)
+    response.raise_for_status()
+    return orjson.loads(response.content).get("results", [])
+
+
+def maintenance_checks(
+    snapshot: Any,
+    stale_days: int = 180,
+    index: TreeIndex | None = None,
+) -> list[CheckResult]:
     """Run release cadence and activity freshness checks."""
 
+    if index is None:
+        index = TreeIndex.from_paths(snapshot.tree_paths)
     checks: list[CheckResult] = []
     checks.append(
         CheckResult(
@@ -999,10 +1136,7 @@ def maintenance_checks(snapshot: Any, stale_days: int = 180) -> list[CheckResult
         )
     )
 
-    has_support_doc = any(
-        path.lower().split("/")[-1] in {"support.md", "maintainers.md", "maintainer.md"}
-        for path in snapshot.tree_paths
-    )
+    has_support_doc = not index.name_set.isdisjoint({"support.md", "maintainers.md", "maintainer.md"})
     checks.append(
         CheckResult(
             id="support_docs",
@@ -1021,7 +1155,7 @@ def maintenance_checks(snapshot: Any, stale_days: int = 180) -> list[CheckResult
         )
     )
 
-    has_changelog = any(path.lower().split("/")[-1] in CHANGELOG_FILENAMES for path in snapshot.tree_paths)
+    has_changelog = not index.name_set.isdisjoint(CHANGELOG_FILENAMES)
     checks.append(
         CheckResult(
             id="release_notes_file",
@@ -1042,10 +1176,12 @@ def maintenance_checks(snapshot: Any, stale_days: int = 180) -> list[CheckResult
     return checks
 
 
-def governance_checks(snapshot: Any) -> list[CheckResult]:
+def governance_checks(snapshot: Any, index: TreeIndex | None = None) -> list[CheckResult]:
     """Run repository governance checks (templates, CODEOWNERS, security policy)."""
 
-    lower_paths = [path.lower() for path in snapshot.tree_paths]
+    if index is None:
+        index = TreeIndex.from_paths(snapshot.tree_paths)
+    lower_paths = index.lower_paths
     has_codeowners = any(path.endswith("codeowners") for path in lower_paths)
     has_pr_template = any(
         path.endswith(".github/pull_request_template.md")
@@ -1113,17 +1249,46 @@ def run_all_checks(
     snapshot: Any,
     enable_network: bool = True,
     policy: RepoPolicy | None = None,
+    index: TreeIndex | None = None,
 ) -> dict[str, list[CheckResult]]:
-    """Execute all check categories and apply policy-based filtering."""
+    """Execute all check categories and apply policy-based filtering.
+
+    The tree index (built here unless the caller passes one) and the workflow texts are
+    computed once and shared by every checker that needs them. The security category,
+    which may wait on OSV, runs in a helper thread while the CPU-bound categories run on
+    the calling thread.
+    """
 
     policy = policy or RepoPolicy()
+    if index is None:
+        index = TreeIndex.from_paths(snapshot.tree_paths)
+    workflow_texts = WorkflowTexts.from_snapshot(snapshot)
+
+    def run_security() -> list[CheckResult]:
+        return security_checks(
+            snapshot,
+            enable_network=enable_network,
+            policy=policy,
+            index=index,
+            workflow_texts=workflow_texts,
+        )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        security_future = executor.submit(run_security)
+        docs = docs_checks(snapshot, readme_min_length=policy.readme_min_length, index=index)
+        ci = ci_checks(snapshot, workflow_texts=workflow_texts)
+        quality = quality_checks(snapshot, index=index, workflow_texts=workflow_texts)
+        maintenance = maintenance_checks(snapshot, stale_days=policy.stale_days, index=index)
+        governance = governance_checks(snapshot, index=index)
+        security = security_future.result()
+
     checks_by_category = {
-        "docs": docs_checks(snapshot, readme_min_length=policy.readme_min_length),
-        "ci": ci_checks(snapshot),
-        "security": security_checks(snapshot, enable_network=enable_network, policy=policy),
-        "quality": quality_checks(snapshot),
-        "maintenance": maintenance_checks(snapshot, stale_days=policy.stale_days),
-        "governance": governance_checks(snapshot),
+        "docs": docs,
+        "ci": ci,
+        "security": security,
+        "quality": quality,
+        "maintenance": maintenance,
+        "governance": governance,
     }
     checks_by_category["governance"].append(_policy_validity_check(policy))
     return apply_ignore_checks(checks_by_category, policy.ignore_checks)
@@ -1157,12 +1322,43 @@ def _policy_validity_check(policy: RepoPolicy) -> CheckResult:
     )
 
 
+def _workflow_has_push_or_pr_trigger(content: str) -> bool:
+    """Return whether any YAML document of a workflow triggers on push or pull_request.
+
+    Documents are only composed into nodes, which still reports syntax errors; just the
+    top-level keys and the `on` value are built into Python objects. That skips
+    constructing the (usually much larger) `jobs` tree. Stops at the first match.
+    """
+
+    loader = YAML_LOADER(content)
+    try:
+        while loader.check_node():
+            node = loader.get_node()
+            if not isinstance(node, yaml.MappingNode):
+                continue
+            top_level = {
+                loader.construct_object(key_node): value_node
+                for key_node, value_node in node.value
+                if isinstance(key_node, yaml.ScalarNode)
+            }
+            on_node = _extract_workflow_on_config(top_level)
+            if on_node is not None and _has_push_or_pr_trigger(loader.construct_object(on_node, deep=True)):
+                return True
+    finally:
+        loader.dispose()
+    return False
+
+
 def _has_push_or_pr_trigger(on_config: Any) -> bool:
-    if isinstance(on_config, str):
-        return on_config in {"push", "pull_request"}
-    if isinstance(on_config, list):
-        return any(item in {"push", "pull_request"} for item in on_config if isinstance(item, str))
-    if isinstance(on_config, dict):
+    # Safe-loaded YAML only yields exact builtin types, so `type() is` is enough.
+    config_type = type(on_config)
+    if config_type is str:
+        return on_config in PUSH_OR_PR_TRIGGERS
+    if config_type is list:
+        # Non-string items (e.g. mappings) may be unhashable, so they are filtered first.
+        return not PUSH_OR_PR_TRIGGERS.isdisjoint(item for item in on_config if type(item) is str)
+    if config_type is dict:
+        # Two hash lookups beat iterating every event key of the mapping.
         return "push" in on_config or "pull_request" in on_config
     return False
 
@@ -1314,7 +1510,7 @@ def _parse_composer_lock(content: str) -> set[DependencyRef]:
 def _parse_pubspec_lock(content: str) -> set[DependencyRef]:
     refs: set[DependencyRef] = set()
     try:
-        payload = yaml.safe_load(content) or {}
+        payload = yaml.load(content, Loader=YAML_LOADER) or {}
     except yaml.YAMLError:
         return refs
     if not isinstance(payload, dict):
@@ -1334,7 +1530,7 @@ def _parse_pubspec_lock(content: str) -> set[DependencyRef]:
 def _parse_pubspec_yaml(content: str) -> set[DependencyRef]:
     refs: set[DependencyRef] = set()
     try:
-        payload = yaml.safe_load(content) or {}
+        payload = yaml.load(content, Loader=YAML_LOADER) or {}
     except yaml.YAMLError:
         return refs
     if not isinstance(payload, dict):
@@ -1372,9 +1568,10 @@ def _looks_like_version(value: str) -> bool:
 
 
 def _safe_json_load(content: str) -> Any:
+    # orjson: lockfiles such as package-lock.json are often megabytes and are parsed on every scan.
     try:
-        return json.loads(content)
-    except json.JSONDecodeError:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
         return {}
 
 
@@ -1389,7 +1586,7 @@ def _count_lines(content: str) -> int:
 
 def _extension(path: str) -> str:
     lower = path.lower()
-    filename = lower.split("/")[-1]
+    filename = lower.rpartition("/")[2]
     idx = filename.rfind(".")
     if idx >= 0:
         return filename[idx:]
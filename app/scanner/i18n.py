@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import copy
 import re
+from functools import lru_cache
 from typing import Any
 
 from app.i18n_store import get_translation_section
@@ -11,6 +12,7 @@ from app.i18n_store import get_translation_section
 SUPPORTED_LANGS = {"en", "ru"}
 
 
+@lru_cache(maxsize=32)
 def normalize_lang(lang: str | None) -> str:
     """Normalize language code to supported values (`en` or `ru`)."""
 
@@ -0,0 +1,87 @@
+"""On-disk cache of OSV vulnerability lookups.
+
+Pinned dependency versions rarely change between scans, so OSV answers are kept in a
+small SQLite file keyed by `(ecosystem, name, version)` and reused until they are older
+than the configured TTL. WAL mode lets scan threads and pool processes read the file
+while another one writes to it.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+import orjson
+
+DependencyKey = tuple[str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS osv_results (
+    ecosystem TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,
+    vulns_json BLOB NOT NULL,
+    PRIMARY KEY (ecosystem, name, version)
+)
+"""
+# Stay well below SQLite's bound-parameter limit (3 per key).
+_LOOKUP_CHUNK_SIZE = 200
+
+
+class OsvCache:
+    """Vulnerability ids per dependency, stored with the time they were fetched."""
+
+    __slots__ = ("_conn", "_lock")
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; the lock serialises the scan threads sharing this connection.
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=5.0)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_many(self, keys: Iterable[DependencyKey], max_age_seconds: int) -> dict[DependencyKey, list[str]]:
+        """Return cached vulnerability ids for the keys fetched within `max_age_seconds`."""
+
+        wanted = list(keys)
+        cutoff = int(time.time()) - max_age_seconds
+        found: dict[DependencyKey, list[str]] = {}
+        with self._lock:
+            for start in range(0, len(wanted), _LOOKUP_CHUNK_SIZE):
+                chunk = wanted[start : start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("(?,?,?)" for _ in chunk)
+                rows = self._conn.execute(
+                    "SELECT ecosystem, name, version, vulns_json FROM osv_results "
+                    f"WHERE (ecosystem, name, version) IN (VALUES {placeholders}) AND fetched_at >= ?",
+                    [*(part for key in chunk for part in key), cutoff],
+                )
+                for ecosystem, name, version, vulns_json in rows:
+                    found[(ecosystem, name, version)] = orjson.loads(vulns_json)
+        return found
+
+    def put_many(self, results: dict[DependencyKey, list[str]]) -> None:
+        """Store fresh vulnerability ids, replacing older entries for the same keys."""
+
+        fetched_at = int(time.time())
+        rows = [(*key, fetched_at, orjson.dumps(vuln_ids)) for key, vuln_ids in results.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO osv_results (ecosystem, name, version, fetched_at, vulns_json) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
@@ -10,6 +10,8 @@ import yaml
 
 from app.scanner.schemas import CheckResult
 
+# libyaml-backed safe loader when available, as in `app.config`; shared with the checks.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 POLICY_PATHS = (
     ".repo-inspector.yml",
     ".repo-inspector.yaml",
@@ -63,7 +65,7 @@ def load_repo_policy(snapshot: Any) -> RepoPolicy:
 
     policy = RepoPolicy(source_path=source_path)
     try:
-        raw = yaml.safe_load(content) or {}
+        raw = yaml.load(content, Loader=YAML_LOADER) or {}
     except yaml.YAMLError as exc:
         policy.validation_errors.append(f"Invalid YAML: {exc}")
         return policy
@@ -133,6 +133,19 @@ def build_report(
     )
 
 
+def compute_score_total(
+    checks_by_category: dict[str, list[CheckResult]],
+    category_weights: dict[str, int] | None = None,
+) -> int:
+    """Return the total score `build_report` would produce, without building the report."""
+
+    resolved_weights = _resolve_weights(category_weights or {})
+    total_score = 0.0
+    for category_id, (_, weight) in resolved_weights.items():
+        total_score += _score_category(category_id, weight, checks_by_category.get(category_id, []))
+    return round(total_score)
+
+
 def build_fix_plan(categories: list[CategoryReport]) -> list[FixPlanItem]:
     """Create prioritized remediation plan from non-passing checks."""
 
@@ -49,3 +49,22 @@ def test_legacy_stats_svg_head_returns_image_headers_without_body() -> None:
     assert response.headers["content-type"].startswith("image/svg+xml")
     assert response.headers["cache-control"] == "public, max-age=21600"
     assert response.content == b""
+
+
+def test_repo_stats_json_honours_if_none_match(monkeypatch) -> None:
+    import app.main as main
+
+    async def fake_payload(owner: str, repo: str, langs_count: int = 10) -> dict:
+        return {"repository": {"full_name": f"{owner}/{repo}", "stars": 1}, "generated_at": str(object())}
+
+    monkeypatch.setattr(main, "_build_public_repo_stats_payload", fake_payload)
+
+    first = client.get("/api/stats/repo/octocat/Hello-World.json")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert etag.startswith('W/"')
+
+    second = client.get("/api/stats/repo/octocat/Hello-World.json", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
@@ -1,6 +1,10 @@
+import asyncio
+import json
+
 import httpx
+import pytest
 
-from app.github_client import GitHubClient
+from app.github_client import GitHubClient, GitHubRateLimitError
 
 
 def test_pick_line_count_files_includes_dart_files():
@@ -12,9 +16,9 @@ def test_pick_line_count_files_includes_dart_files():
         "src/app.ts",
         ".dart_tool/package_config.json",
     ]
-    path_sizes = {path: 1024 for path in tree_paths}
+    blobs = [(path, path.lower(), 1024) for path in tree_paths]
 
-    picked, total = client._pick_line_count_files(tree_paths, path_sizes)
+    picked, total = client._pick_line_count_files(blobs)
 
     assert "lib/main.dart" in picked
     assert "lib/src/widget.dart" in picked
@@ -42,9 +46,9 @@ def test_pick_line_count_files_supports_common_extra_extensions_and_filenames():
         "Makefile",
         "notes/readme.txt",
     ]
-    path_sizes = {path: 1024 for path in tree_paths}
+    blobs = [(path, path.lower(), 1024) for path in tree_paths]
 
-    picked, total = client._pick_line_count_files(tree_paths, path_sizes)
+    picked, total = client._pick_line_count_files(blobs)
 
     assert "frontend/app.mjs" in picked
     assert "web/index.html" in picked
@@ -65,3 +69,188 @@ def test_http_error_detail_for_blank_connect_error():
 def test_http_error_detail_prefers_exception_message():
     detail = GitHubClient._http_error_detail(httpx.HTTPError("boom"))
     assert detail == "boom"
+
+
+def test_graphql_url_supports_enterprise_api_base():
+    assert GitHubClient._graphql_url("https://api.github.com") == "https://api.github.com/graphql"
+    assert (
+        GitHubClient._graphql_url("https://ghe.example.com/api/v3") == "https://ghe.example.com/api/graphql"
+    )
+
+
+def test_get_repo_snapshot_tolerates_missing_branch_and_license():
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/repos/octocat/repo":
+            return httpx.Response(200, json={"default_branch": "main", "license": None})
+        if "/git/trees/" in path:
+            return httpx.Response(200, json={"tree": [{"path": "README.md", "type": "blob", "size": 4}]})
+        if path.endswith(("/releases", "/tags")):
+            return httpx.Response(200, json=[])
+        if "/contents/" in path:
+            if request.headers["accept"] == "application/vnd.github.raw":
+                return httpx.Response(415, json={"message": "Unsupported Media Type"})
+            return httpx.Response(200, json={"encoding": "base64", "content": "aGk="})
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    async def scan():
+        async with GitHubClient() as client:
+            client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await client.get_repo_snapshot("octocat", "repo")
+
+    snapshot = asyncio.run(scan())
+
+    assert snapshot.default_branch_sha is None
+    assert snapshot.has_license is False
+    assert snapshot.tree_paths == ["README.md"]
+    assert snapshot.file_contents == {"README.md": "hi"}
+
+
+def test_fetch_files_uses_graphql_batch_with_rest_fallback():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/graphql":
+            variables = json.loads(request.content)["variables"]
+            assert variables["e0"] == "main:README.md"
+            data = {"f0": {"text": "readme", "isBinary": False, "isTruncated": False}, "f1": None}
+            return httpx.Response(200, json={"data": {"repository": data}})
+        assert request.headers["accept"] == "application/vnd.github.raw"
+        return httpx.Response(200, content=b"rest", headers={"content-type": "application/vnd.github.raw"})
+
+    async def fetch():
+        async with GitHubClient(token="secret") as client:
+            client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await client._fetch_files("octocat", "repo", ["README.md", "docs/a.md"], "main")
+
+    contents = asyncio.run(fetch())
+
+    assert contents == {"README.md": "readme", "docs/a.md": "rest"}
+    assert seen == ["/graphql", "/repos/octocat/repo/contents/docs/a.md"]
+
+
+def test_fetch_single_file_keeps_raw_json_files_labelled_as_json():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b'{"name": "web"}', headers={"content-type": "application/json"})
+
+    async def fetch():
+        async with GitHubClient() as client:
+            client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await client._fetch_files("octocat", "repo", ["package.json"], "main")
+
+    assert asyncio.run(fetch()) == {"package.json": '{"name": "web"}'}
+
+
+def test_get_repo_snapshot_expands_truncated_tree():
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        recursive = request.url.params.get("recursive") == "1"
+        if path == "/repos/octocat/repo":
+            return httpx.Response(200, json={"default_branch": "main", "license": {"spdx_id": "MIT"}})
+        if path.endswith("/git/trees/main") and recursive:
+            return httpx.Response(200, json={"tree": [], "truncated": True})
+        if path.endswith("/git/trees/main"):
+            root = [
+                {"path": "README.md", "type": "blob", "size": 4},
+                {"path": "src", "type": "tree", "sha": "src-sha"},
+            ]
+            return httpx.Response(200, json={"tree": root, "truncated": False})
+        if path.endswith("/git/trees/src-sha"):
+            nested = [{"path": "pkg", "type": "tree"}, {"path": "pkg/app.py", "type": "blob", "size": 4}]
+            return httpx.Response(200, json={"tree": nested, "truncated": False})
+        if path.endswith(("/releases", "/tags", "/branches/main")):
+            return httpx.Response(200, json=[])
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    async def scan():
+        async with GitHubClient() as client:
+            client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await client.get_repo_snapshot("octocat", "repo")
+
+    snapshot = asyncio.run(scan())
+
+    assert snapshot.tree_paths == ["README.md", "src/pkg/app.py"]
+    assert snapshot.line_count_paths == ["src/pkg/app.py"]
+
+
+def test_truncated_tree_walk_keeps_original_entries_for_failed_or_skipped_subtrees():
+    truncated = [
+        {"path": "README.md", "type": "blob", "size": 4},
+        {"path": "src/a.py", "type": "blob", "size": 4},
+        {"path": "lib/b.py", "type": "blob", "size": 4},
+        {"path": "docs/c.md", "type": "blob", "size": 4},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/git/trees/main"):
+            root = [
+                {"path": "README.md", "type": "blob", "size": 4},
+                {"path": "src", "type": "tree", "sha": "src-sha"},
+                {"path": "lib", "type": "tree", "sha": "lib-sha"},
+                {"path": "docs", "type": "tree", "sha": "docs-sha"},
+            ]
+            return httpx.Response(200, json={"tree": root, "truncated": False})
+        if path.endswith("/git/trees/src-sha"):
+            return httpx.Response(502, json={"message": "Server Error"})
+        if path.endswith("/git/trees/lib-sha"):
+            nested = [
+                {"path": "b.py", "type": "blob", "size": 4},
+                {"path": "d.py", "type": "blob", "size": 4},
+            ]
+            return httpx.Response(200, json={"tree": nested, "truncated": False})
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    async def walk():
+        async with GitHubClient() as client:
+            client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            # Root plus two subtrees: src fails, docs does not fit the budget.
+            client.MAX_TRUNCATED_TREE_REQUESTS = 3
+            return await client._walk_truncated_tree("octocat", "repo", "main", truncated)
+
+    items = asyncio.run(walk())
+
+    paths = sorted(item["path"] for item in items)
+    assert paths == ["README.md", "docs/c.md", "lib/b.py", "lib/d.py", "src/a.py"]
+
+
+def test_get_repo_public_stats_fetches_metadata_in_one_round():
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/repos/octocat/repo":
+            return httpx.Response(200, json={"full_name": "octocat/repo", "stargazers_count": 7})
+        return httpx.Response(200, json=[] if request.url.path.endswith(("/releases", "/tags")) else {})
+
+    async def fetch():
+        async with GitHubClient() as client:
+            client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await client.get_repo_public_stats("octocat", "repo")
+
+    stats = asyncio.run(fetch())
+
+    assert stats.stars == 7
+    assert sorted(calls) == [
+        "/repos/octocat/repo",
+        "/repos/octocat/repo/languages",
+        "/repos/octocat/repo/releases",
+        "/repos/octocat/repo/tags",
+    ]
+
+
+def test_fetch_files_aborts_on_rate_limit():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/contents/b.py"):
+            headers = {"x-ratelimit-remaining": "0"}
+            return httpx.Response(403, json={"message": "API rate limit exceeded"}, headers=headers)
+        return httpx.Response(200, content=b"ok", headers={"content-type": "application/vnd.github.raw"})
+
+    async def fetch():
+        async with GitHubClient() as client:
+            client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await client._fetch_files("octocat", "repo", ["a.py", "b.py", "c.py"], "main")
+
+    with pytest.raises(GitHubRateLimitError):
+        asyncio.run(fetch())
@@ -0,0 +1,25 @@
+import pytest
+
+from app.main import parse_repo_url
+
+
+def test_parse_repo_url_accepts_common_forms() -> None:
+    assert parse_repo_url("https://github.com/octocat/Hello-World") == ("octocat", "Hello-World")
+    assert parse_repo_url(" http://github.com/octocat/Hello-World.git/ ") == ("octocat", "Hello-World")
+    assert parse_repo_url("https://github.com/octocat/.git") == ("octocat", ".git")
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://github.com/octocat",
+        "https://github.com/octocat/",
+        "https://github.com/octocat/repo/tree/main",
+        "https://github.com/octocat/repo#readme",
+        "https://github.com/octo cat/repo",
+        "https://gitlab.com/octocat/repo",
+    ],
+)
+def test_parse_repo_url_rejects_invalid_urls(url: str) -> None:
+    with pytest.raises(ValueError):
+        parse_repo_url(url)
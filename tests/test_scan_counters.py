@@ -0,0 +1,31 @@
+from app.scan_counters import SharedScanCounters
+
+
+def test_shared_counters_enforce_minute_and_day_limits_across_workers(tmp_path):
+    path = str(tmp_path / "rqi_rate")
+    first = SharedScanCounters(path, slots=64)
+    second = SharedScanCounters(path, slots=64)
+    try:
+        assert first.acquire("1.2.3.4", 6000, 2, 7, 3) is None
+        assert second.acquire("1.2.3.4", 6000, 2, 7, 3) is None
+        assert first.acquire("1.2.3.4", 6000, 2, 7, 3) == "minute"
+        assert second.acquire("1.2.3.4", 6060, 2, 7, 3) is None
+        assert first.acquire("1.2.3.4", 6120, 2, 7, 3) == "day"
+        assert second.acquire("1.2.3.4", 6180, 2, 8, 3) is None
+        assert first.acquire("5.6.7.8", 6180, 2, 8, 0) is None
+    finally:
+        first.close()
+        second.close()
+
+
+def test_shared_counters_use_a_sliding_minute_window(tmp_path):
+    counters = SharedScanCounters(str(tmp_path / "rqi_rate"), slots=64)
+    try:
+        assert counters.acquire("1.2.3.4", 6058, 2, 7, 0) is None
+        assert counters.acquire("1.2.3.4", 6059, 2, 7, 0) is None
+        # A fixed minute window would reset at 6060 and allow a burst of 2 more here.
+        assert counters.acquire("1.2.3.4", 6060, 2, 7, 0) == "minute"
+        assert counters.acquire("1.2.3.4", 6118, 2, 7, 0) is None
+        assert counters.acquire("1.2.3.4", 6118, 2, 7, 0) == "minute"
+    finally:
+        counters.close()
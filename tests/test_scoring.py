@@ -1,5 +1,5 @@
 from app.scanner.schemas import CheckResult, ProjectMetrics
-from app.scanner.scoring import build_report, check_weight_map
+from app.scanner.scoring import build_report, check_weight_map, compute_score_total
 
 
 def _metrics() -> ProjectMetrics:
@@ -179,3 +179,21 @@ def test_check_weight_map_skips_non_scoring_checks():
     assert "policy_config_valid" not in weights
     assert "score_regression_guard" not in weights
     assert round(weights.get("codeowners_exists", 0.0), 4) == 10.0
+
+
+def test_compute_score_total_matches_build_report():
+    checks = _base_checks()
+    checks["security"] = [_check("secret_patterns", "fail"), _check("dependency_hygiene", "warn")]
+    checks["docs"] = []
+    weights = {"security": 40, "docs": 5}
+
+    report = build_report(
+        repo_owner="octocat",
+        repo_name="repo",
+        repo_url="https://github.com/octocat/repo",
+        checks_by_category=checks,
+        project_metrics=_metrics(),
+        category_weights=weights,
+    )
+
+    assert compute_score_total(checks, weights) == report.score_total